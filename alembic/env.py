@@ -1,8 +1,11 @@
 import os
+import re
 from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -29,10 +32,21 @@ if config.config_file_name is not None:
 
 from src.db.base import Base, DB_SCHEMA   # <-- CHANGE THIS LINE if needed
 import src.db.models  # noqa: F401        # <-- CHANGE THIS LINE if needed
+from src.db.sqlite import build_sqlite_engine, is_sqlite_url
 
 target_metadata = Base.metadata
 
 
+_NOW_DEFAULT_RE = re.compile(r"DEFAULT \(?now\(\)\)?", re.IGNORECASE)
+
+
+@compiles(CreateColumn, "sqlite")
+def _sqlite_now_default(element, compiler, **kw):
+    # Revisions written for Postgres use server_default=sa.text('now()'), which
+    # SQLite does not have; applied revisions are not edited, so translate here
+    return _NOW_DEFAULT_RE.sub("DEFAULT CURRENT_TIMESTAMP", compiler.visit_create_column(element, **kw))
+
+
 def get_url() -> str:
     url = os.getenv("DATABASE_URL")
     if not url:
@@ -59,19 +73,26 @@ def run_migrations_offline() -> None:
 
 def run_migrations_online() -> None:
     """Run migrations with a live DB connection."""
-    configuration = config.get_section(config.config_ini_section) or {}
-    configuration["sqlalchemy.url"] = get_url()
-
-    connectable = engine_from_config(
-        configuration,
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    url = get_url()
+    sqlite = is_sqlite_url(url)
+
+    if sqlite:
+        # Edge mode: the file is attached as schema ipds on connect
+        connectable = build_sqlite_engine(url, poolclass=pool.NullPool)
+    else:
+        configuration = config.get_section(config.config_ini_section) or {}
+        configuration["sqlalchemy.url"] = url
+        connectable = engine_from_config(
+            configuration,
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+        )
 
     with connectable.connect() as connection:
         # ✅ Ensure schema exists BEFORE tables are created in it
-        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA};"))
-        connection.commit()
+        if not sqlite:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA};"))
+            connection.commit()
 
         context.configure(
             connection=connection,
@@ -79,6 +100,7 @@ def run_migrations_online() -> None:
             include_schemas=True,
             version_table_schema=DB_SCHEMA,
             compare_type=True,
+            render_as_batch=sqlite,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,32 @@
+"""decisions version column
+
+Revision ID: 3c7d2e9a1b40
+Revises: 91b0a94299d7
+Create Date: 2026-10-19 09:12:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d2e9a1b40'
+down_revision: Union[str, Sequence[str], None] = '91b0a94299d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'decisions',
+        sa.Column('version', sa.BigInteger(), server_default='1', nullable=False),
+        schema='ipds',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('decisions', 'version', schema='ipds')
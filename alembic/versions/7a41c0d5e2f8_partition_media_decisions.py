@@ -0,0 +1,211 @@
+"""partition media and decisions by import_session_id range
+
+Revision ID: 7a41c0d5e2f8
+Revises: 3c7d2e9a1b40
+Create Date: 2026-10-19 10:03:11.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a41c0d5e2f8'
+down_revision: Union[str, Sequence[str], None] = '3c7d2e9a1b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+MEDIA_COLUMNS = "media_id, import_session_id, adapter, vendor_id, filename, size_bytes, captured_at, imported_at, local_path"
+DECISION_COLUMNS = "decision_id, media_id, import_session_id, status, reason, decided_at, notes, version"
+
+# Fixed here rather than imported from src.db.partitions, so this revision always
+# builds the same layout: 1000 sessions per partition, 3 empty ones ahead.
+# Later partitions are created by src.db.partitions with its own settings.
+SESSION_SPAN = 1000
+PARTITIONS_AHEAD = 3
+
+
+def _create_partition_range(lo: int, hi: int) -> None:
+    for table in ("media", "decisions"):  # decisions reference media
+        op.execute(
+            f"CREATE TABLE ipds.{table}_s{lo}_{hi} "
+            f"PARTITION OF ipds.{table} FOR VALUES FROM ({lo}) TO ({hi})"
+        )
+
+
+def _create_tables(partitioned: bool) -> None:
+    """
+    Rename the current tables to *_old and create bare replacements (no keys yet);
+    constraint and index names are only reused after the old tables are dropped.
+    """
+    op.execute("ALTER TABLE ipds.decisions RENAME TO decisions_old")
+    op.execute("ALTER TABLE ipds.media RENAME TO media_old")
+
+    partition_clause = " PARTITION BY RANGE (import_session_id)" if partitioned else ""
+    op.execute(f"""
+        CREATE TABLE ipds.media (
+          media_id          BIGINT NOT NULL DEFAULT nextval('ipds.media_media_id_seq'),
+          import_session_id BIGINT NOT NULL,
+          adapter           TEXT NOT NULL,
+          vendor_id         TEXT NOT NULL,
+          filename          TEXT,
+          size_bytes        BIGINT NOT NULL DEFAULT 0,
+          captured_at       TIMESTAMPTZ,
+          imported_at       TIMESTAMPTZ NOT NULL DEFAULT now(),
+          local_path        TEXT NOT NULL
+        ){partition_clause}
+    """)
+    op.execute(f"""
+        CREATE TABLE ipds.decisions (
+          decision_id       BIGINT NOT NULL DEFAULT nextval('ipds.decisions_decision_id_seq'),
+          media_id          BIGINT NOT NULL,
+          import_session_id BIGINT NOT NULL,
+          status            TEXT NOT NULL,
+          reason            TEXT,
+          decided_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+          notes             TEXT,
+          version           BIGINT NOT NULL DEFAULT 1
+        ){partition_clause}
+    """)
+
+
+def _copy_and_drop_old() -> None:
+    op.execute(f"INSERT INTO ipds.media ({MEDIA_COLUMNS}) SELECT {MEDIA_COLUMNS} FROM ipds.media_old")
+    op.execute(f"INSERT INTO ipds.decisions ({DECISION_COLUMNS}) SELECT {DECISION_COLUMNS} FROM ipds.decisions_old")
+    # Dropping a partitioned parent drops its attached partitions with it
+    op.execute("DROP TABLE ipds.decisions_old")
+    op.execute("DROP TABLE ipds.media_old")
+
+
+def _add_media_constraints(pk: str, dedupe: str) -> None:
+    op.execute(f"ALTER TABLE ipds.media ADD CONSTRAINT media_pkey PRIMARY KEY ({pk})")
+    op.execute(f"ALTER TABLE ipds.media ADD CONSTRAINT media_dedupe_uq UNIQUE ({dedupe})")
+    op.execute(
+        "ALTER TABLE ipds.media ADD CONSTRAINT media_import_session_id_fkey "
+        "FOREIGN KEY (import_session_id) REFERENCES ipds.import_session(import_session_id) "
+        "ON UPDATE CASCADE ON DELETE RESTRICT"
+    )
+    op.execute("CREATE INDEX idx_media_import_session_id ON ipds.media(import_session_id)")
+    op.execute("CREATE INDEX idx_media_imported_at ON ipds.media(imported_at)")
+
+
+def _add_decision_constraints(pk: str, media_fk: str) -> None:
+    op.execute(f"ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_pkey PRIMARY KEY ({pk})")
+    op.execute(
+        "ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_one_per_media_uq "
+        "UNIQUE (import_session_id, media_id)"
+    )
+    op.execute(
+        "ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_status_chk "
+        "CHECK (status IN ('accepted','rejected'))"
+    )
+    op.execute(
+        f"ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_media_id_fkey "
+        f"FOREIGN KEY ({media_fk}) REFERENCES ipds.media({media_fk}) "
+        "ON UPDATE CASCADE ON DELETE RESTRICT"
+    )
+    op.execute(
+        "ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_import_session_id_fkey "
+        "FOREIGN KEY (import_session_id) REFERENCES ipds.import_session(import_session_id) "
+        "ON UPDATE CASCADE ON DELETE RESTRICT"
+    )
+
+
+def _own_sequences(owned: bool) -> None:
+    media_owner = "ipds.media.media_id" if owned else "NONE"
+    decision_owner = "ipds.decisions.decision_id" if owned else "NONE"
+    op.execute(f"ALTER SEQUENCE ipds.media_media_id_seq OWNED BY {media_owner}")
+    op.execute(f"ALTER SEQUENCE ipds.decisions_decision_id_seq OWNED BY {decision_owner}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    # decisions carries the partition key of its media row
+    op.add_column('decisions', sa.Column('import_session_id', sa.BigInteger(), nullable=True), schema='ipds')
+    op.execute(
+        "UPDATE ipds.decisions SET import_session_id = ("
+        "SELECT m.import_session_id FROM ipds.media m WHERE m.media_id = ipds.decisions.media_id)"
+    )
+
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table('decisions', schema='ipds') as batch:
+            batch.alter_column('import_session_id', nullable=False)
+            batch.drop_constraint('decisions_one_per_media_uq', type_='unique')
+            batch.create_unique_constraint('decisions_one_per_media_uq', ['import_session_id', 'media_id'])
+            batch.create_foreign_key(
+                'decisions_import_session_id_fkey', 'import_session',
+                ['import_session_id'], ['import_session_id'],
+                referent_schema='ipds', onupdate='CASCADE', ondelete='RESTRICT',
+            )
+        return
+
+    _own_sequences(False)
+    _create_tables(partitioned=True)
+
+    lo_id, hi_id = bind.execute(sa.text(
+        "SELECT COALESCE(MIN(import_session_id), 0), COALESCE(MAX(import_session_id), 0) FROM ipds.import_session"
+    )).one()
+    lo = (int(lo_id) // SESSION_SPAN) * SESSION_SPAN
+    target_hi = (int(hi_id) // SESSION_SPAN + 1 + PARTITIONS_AHEAD) * SESSION_SPAN
+
+    while lo < target_hi:
+        _create_partition_range(lo, lo + SESSION_SPAN)
+        lo += SESSION_SPAN
+    _copy_and_drop_old()
+
+    # Unique keys on a partitioned table must contain the partition key; the global
+    # (adapter, vendor_id) key is restored by revision b5c1e7d94a30 (media_dedupe)
+    _add_media_constraints(pk="import_session_id, media_id", dedupe="adapter, vendor_id, import_session_id")
+    _add_decision_constraints(pk="import_session_id, decision_id", media_fk="import_session_id, media_id")
+    _own_sequences(True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        with op.batch_alter_table('decisions', schema='ipds') as batch:
+            batch.drop_constraint('decisions_import_session_id_fkey', type_='foreignkey')
+            batch.drop_constraint('decisions_one_per_media_uq', type_='unique')
+            batch.create_unique_constraint('decisions_one_per_media_uq', ['media_id'])
+            batch.drop_column('import_session_id')
+        return
+
+    # Partitioned media only enforces (adapter, vendor_id) per session before
+    # revision b5c1e7d94a30, so cross-session duplicates may exist and would
+    # break the global UNIQUE restored below
+    duplicates = bind.execute(sa.text(
+        "SELECT adapter, vendor_id, array_agg(import_session_id ORDER BY import_session_id) "
+        "FROM ipds.media GROUP BY adapter, vendor_id HAVING count(*) > 1 LIMIT 20"
+    )).all()
+    if duplicates:
+        listing = "; ".join(f"{a}/{v} in sessions {list(s)}" for a, v, s in duplicates)
+        raise RuntimeError(
+            "Cannot restore UNIQUE (adapter, vendor_id): media imported into several sessions "
+            f"must be removed first ({listing})"
+        )
+
+    _own_sequences(False)
+    _create_tables(partitioned=False)
+    _copy_and_drop_old()
+
+    _add_media_constraints(pk="media_id", dedupe="adapter, vendor_id")
+    op.execute("ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_pkey PRIMARY KEY (decision_id)")
+    op.execute("ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_one_per_media_uq UNIQUE (media_id)")
+    op.execute(
+        "ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_status_chk "
+        "CHECK (status IN ('accepted','rejected'))"
+    )
+    op.execute(
+        "ALTER TABLE ipds.decisions ADD CONSTRAINT decisions_media_id_fkey "
+        "FOREIGN KEY (media_id) REFERENCES ipds.media(media_id) "
+        "ON UPDATE CASCADE ON DELETE RESTRICT"
+    )
+    op.drop_column('decisions', 'import_session_id', schema='ipds')
+    _own_sequences(True)
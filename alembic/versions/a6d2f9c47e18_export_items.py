@@ -0,0 +1,59 @@
+"""export_items lineage table
+
+Revision ID: a6d2f9c47e18
+Revises: e4c9a7b3f210
+Create Date: 2026-10-19 16:21:05.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.partitions import is_partitioned
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f9c47e18'
+down_revision: Union[str, Sequence[str], None] = 'e4c9a7b3f210'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lineage must outlive media partitions moved to the archive schema, and an FK
+    # into partitioned media would block DETACH PARTITION. Only plain installs get it.
+    media_fk = [] if is_partitioned(op.get_bind(), 'media') else [
+        sa.ForeignKeyConstraint(
+            ['media_id'], ['ipds.media.media_id'],
+            name='export_items_media_id_fkey', onupdate='CASCADE', ondelete='RESTRICT',
+        ),
+    ]
+
+    op.create_table(
+        'export_items',
+        sa.Column('export_id', sa.BigInteger(), nullable=False),
+        sa.Column('seq', sa.BigInteger(), nullable=False),
+        sa.Column('import_session_id', sa.BigInteger(), nullable=False),
+        sa.Column('media_id', sa.BigInteger(), nullable=False),
+        sa.Column('export_name', sa.Text(), nullable=False),
+        sa.Column('sha256', sa.Text(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['export_id'], ['ipds.exports.export_id'],
+            name='export_items_export_id_fkey', onupdate='CASCADE', ondelete='CASCADE',
+        ),
+        *media_fk,
+        sa.PrimaryKeyConstraint('export_id', 'seq'),
+        schema='ipds',
+    )
+    op.create_index('idx_export_items_media_id', 'export_items', ['media_id'], schema='ipds')
+    op.create_index('idx_export_items_sha256', 'export_items', ['sha256'], schema='ipds')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_export_items_sha256', table_name='export_items', schema='ipds')
+    op.drop_index('idx_export_items_media_id', table_name='export_items', schema='ipds')
+    op.drop_table('export_items', schema='ipds')
@@ -0,0 +1,105 @@
+"""global (adapter, vendor_id) dedupe for partitioned media
+
+Revision ID: b5c1e7d94a30
+Revises: a6d2f9c47e18
+Create Date: 2026-10-19 18:05:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5c1e7d94a30'
+down_revision: Union[str, Sequence[str], None] = 'a6d2f9c47e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Unique keys on partitioned media must include import_session_id, so
+# revision 7a41c0d5e2f8 could only enforce (adapter, vendor_id) per session.
+# The global key lives in this small plain table instead, claimed by a trigger
+# inside the same INSERT: a camera file already imported into any session makes
+# the media insert fail with a unique violation, as on unpartitioned installs.
+
+def _media_is_partitioned() -> bool:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = 'ipds' AND c.relname = 'media'"
+    )).first() is not None
+
+
+_TRIGGER_FUNCTION = """
+CREATE FUNCTION ipds.media_dedupe_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    DELETE FROM ipds.media_dedupe WHERE media_id = OLD.media_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO ipds.media_dedupe (adapter, vendor_id, import_session_id, media_id)
+    VALUES (NEW.adapter, NEW.vendor_id, NEW.import_session_id, NEW.media_id);
+  END IF;
+  RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _media_is_partitioned():
+        return  # plain installs keep UNIQUE (adapter, vendor_id) on media itself
+
+    op.execute("""
+        CREATE TABLE ipds.media_dedupe (
+          adapter           TEXT   NOT NULL,
+          vendor_id         TEXT   NOT NULL,
+          import_session_id BIGINT NOT NULL,
+          media_id          BIGINT NOT NULL,
+          CONSTRAINT media_dedupe_pkey PRIMARY KEY (adapter, vendor_id)
+        )
+    """)
+    op.execute("CREATE UNIQUE INDEX idx_media_dedupe_media_id ON ipds.media_dedupe(media_id)")
+
+    # Files imported into several sessions under the per-session key keep their
+    # rows; the earliest import claims the key
+    op.execute("""
+        INSERT INTO ipds.media_dedupe (adapter, vendor_id, import_session_id, media_id)
+        SELECT DISTINCT ON (adapter, vendor_id) adapter, vendor_id, import_session_id, media_id
+        FROM ipds.media
+        ORDER BY adapter, vendor_id, media_id
+    """)
+
+    op.execute(_TRIGGER_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER media_dedupe_sync "
+        "AFTER INSERT OR DELETE OR UPDATE OF adapter, vendor_id, import_session_id, media_id "
+        "ON ipds.media FOR EACH ROW EXECUTE FUNCTION ipds.media_dedupe_sync()"
+    )
+
+    # The per-session key is now implied; keep an index for pre-download lookups
+    op.execute("ALTER TABLE ipds.media DROP CONSTRAINT media_dedupe_uq")
+    op.execute("CREATE INDEX idx_media_adapter_vendor_id ON ipds.media(adapter, vendor_id)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not _media_is_partitioned():
+        return
+
+    op.execute("DROP INDEX ipds.idx_media_adapter_vendor_id")
+    op.execute(
+        "ALTER TABLE ipds.media ADD CONSTRAINT media_dedupe_uq "
+        "UNIQUE (adapter, vendor_id, import_session_id)"
+    )
+    op.execute("DROP TRIGGER media_dedupe_sync ON ipds.media")
+    op.execute("DROP FUNCTION ipds.media_dedupe_sync()")
+    op.drop_table('media_dedupe', schema='ipds')
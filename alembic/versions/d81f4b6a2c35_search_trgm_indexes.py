@@ -0,0 +1,44 @@
+"""trigram indexes for uut_serial and job_id search
+
+Revision ID: d81f4b6a2c35
+Revises: 7a41c0d5e2f8
+Create Date: 2026-10-19 13:40:22.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4b6a2c35'
+down_revision: Union[str, Sequence[str], None] = '7a41c0d5e2f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return  # SQLite edge mode searches with plain LIKE
+
+    # pg_trgm GIN indexes serve both prefix and substring (I)LIKE patterns
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'idx_import_session_uut_serial_trgm', 'import_session', ['uut_serial'],
+        schema='ipds', postgresql_using='gin', postgresql_ops={'uut_serial': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_jobs_job_id_trgm', 'jobs', ['job_id'],
+        schema='ipds', postgresql_using='gin', postgresql_ops={'job_id': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_index('idx_jobs_job_id_trgm', table_name='jobs', schema='ipds')
+    op.drop_index('idx_import_session_uut_serial_trgm', table_name='import_session', schema='ipds')
+    # The extension is left installed; other objects may use it
@@ -0,0 +1,62 @@
+"""decision updated_at and hourly analytics rollups
+
+Revision ID: e4c9a7b3f210
+Revises: d81f4b6a2c35
+Create Date: 2026-10-19 15:02:47.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9a7b3f210'
+down_revision: Union[str, Sequence[str], None] = 'd81f4b6a2c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # batch mode: SQLite cannot ADD COLUMN with a CURRENT_TIMESTAMP default; plain ALTER on Postgres
+    with op.batch_alter_table('decisions', schema='ipds') as batch:
+        batch.add_column(sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False))
+    op.create_index('idx_decisions_decided_at', 'decisions', ['decided_at'], schema='ipds')
+    op.create_index('idx_decisions_updated_at', 'decisions', ['updated_at'], schema='ipds')
+
+    op.create_table(
+        'decision_rollup_hourly',
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('operator_id', sa.Text(), nullable=False),
+        sa.Column('status', sa.Text(), nullable=False),
+        sa.Column('reason', sa.Text(), nullable=False),
+        sa.Column('decision_count', sa.BigInteger(), nullable=False),
+        sa.Column('ingest_to_decision_seconds_sum', sa.Float(), nullable=False),
+        sa.Column('ingest_to_decision_seconds_max', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start', 'operator_id', 'status', 'reason'),
+        schema='ipds',
+    )
+    op.create_index(
+        'idx_decision_rollup_hourly_operator', 'decision_rollup_hourly',
+        ['operator_id', 'bucket_start'], schema='ipds',
+    )
+    op.create_table(
+        'rollup_state',
+        sa.Column('name', sa.Text(), nullable=False),
+        sa.Column('refreshed_through', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        schema='ipds',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rollup_state', schema='ipds')
+    op.drop_index('idx_decision_rollup_hourly_operator', table_name='decision_rollup_hourly', schema='ipds')
+    op.drop_table('decision_rollup_hourly', schema='ipds')
+    op.drop_index('idx_decisions_updated_at', table_name='decisions', schema='ipds')
+    op.drop_index('idx_decisions_decided_at', table_name='decisions', schema='ipds')
+    with op.batch_alter_table('decisions', schema='ipds') as batch:
+        batch.drop_column('updated_at')
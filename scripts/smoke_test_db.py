@@ -67,8 +67,10 @@ def main() -> None:
         s.refresh(m2)
 
         # 4) decisions
-        d1 = Decisions(media_id=m1.media_id, status="accepted", reason="OK", notes="sharp")
-        d2 = Decisions(media_id=m2.media_id, status="rejected", reason="blur", notes="retake")
+        d1 = Decisions(media_id=m1.media_id, import_session_id=sess.import_session_id,
+                       status="accepted", reason="OK", notes="sharp")
+        d2 = Decisions(media_id=m2.media_id, import_session_id=sess.import_session_id,
+                       status="rejected", reason="blur", notes="retake")
         s.add_all([d1, d2])
         s.commit()
 
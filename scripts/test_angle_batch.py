@@ -1,18 +1,31 @@
+import sys
+import time
 from pathlib import Path
 
-from src.ai_model.angle_classifier import AngleClassifier
+from src.ai_model.angle_classifier import DEFAULT_BATCH_SIZE
+from src.ai_model.model_registry import get_angle_classifier
 
 
 def main() -> None:
     model_path = Path("src/ai_model/best_angle_classifier_model_2.pt")
     image_dir = Path("data/test_batch")
+    # Usage: python scripts/test_angle_batch.py [batch_size]
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BATCH_SIZE
 
-    classifier = AngleClassifier(model_path)
+    classifier = get_angle_classifier(model_path)
 
-    for image_path in image_dir.glob("*.*"):
-        result = classifier.predict(image_path)
+    image_paths = sorted(image_dir.glob("*.*"))
+    start = time.perf_counter()
+    results = classifier.predict_batch(image_paths, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    for image_path, result in zip(image_paths, results):
         print(image_path.name, "->", result)
 
+    if image_paths:
+        print(f"{len(image_paths)} images, batch_size={batch_size}: "
+              f"{elapsed:.2f}s ({len(image_paths) / elapsed:.1f} img/s)")
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from src.ai_model.angle_classifier import AngleClassifier
+from src.ai_model.model_registry import get_angle_classifier
 from src.ai_model.angle_suggester import suggest_next_angles
 
 
@@ -8,7 +8,7 @@ def main() -> None:
     model_path = Path("src/ai_model/best_angle_classifier.pt")
     image_path = Path("data/test.jpg")  
 
-    classifier = AngleClassifier(model_path)
+    classifier = get_angle_classifier(model_path)
     result = classifier.predict(image_path)
 
     print("Prediction:", result)
@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Must stay out of the web app until an AI review actually runs
+HEAVY_MODULES = ("torch", "ultralytics", "cv2", "onnxruntime")
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from src.app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def main() -> None:
+    # Usage: python scripts/test_app_startup.py [budget_seconds]
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    # Fresh interpreter, so nothing is already imported
+    env = {**os.environ}
+    if not env.get("DATABASE_URL"):
+        env["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'startup.db'}"
+    proc = subprocess.run([sys.executable, "-c", _CHILD], env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(proc.stderr)
+        sys.exit("create_app() failed")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    print(f"create_app(): {result['seconds']:.2f}s (budget {budget:.2f}s)")
+    failed = False
+    if result["loaded"]:
+        print("heavy modules imported at startup:", ", ".join(result["loaded"]))
+        print("  find the importer with: python -X importtime -c 'from src.app import create_app'")
+        failed = True
+    if result["seconds"] > budget:
+        print("over budget")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+import sys
+import time
+
+from src.config import Config  # noqa: F401  (loads .env)
+from src.core.decision_service import DecisionService
+from src.db.async_session import (
+    AsyncSessionLocal, async_db_health_check, build_async_engine, init_async_session_factory,
+)
+from src.db.session import SessionLocal, build_engine, init_session_factory
+
+
+async def run_async(import_session_id: int) -> tuple[list, list]:
+    engine = build_async_engine()
+    await async_db_health_check(engine)
+    init_async_session_factory(engine)
+    try:
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            rows = await DecisionService.list_media_for_session_async(db, import_session_id)
+            paths = [await DecisionService.find_media_path_async(db, r.media_id) for r in rows]
+            print(f"async: {len(rows)} media, {sum(p is not None for p in paths)} files "
+                  f"in {1000 * (time.perf_counter() - start):.1f} ms")
+            return rows, paths
+    finally:
+        await engine.dispose()
+
+
+def run_sync(import_session_id: int) -> tuple[list, list]:
+    init_session_factory(build_engine())
+    with SessionLocal() as db:
+        start = time.perf_counter()
+        rows = DecisionService.list_media_for_session(db, import_session_id)
+        paths = [DecisionService.find_media_path(db, r.media_id) for r in rows]
+        print(f"sync:  {len(rows)} media, {sum(p is not None for p in paths)} files "
+              f"in {1000 * (time.perf_counter() - start):.1f} ms")
+        return rows, paths
+
+
+def main() -> None:
+    # Usage: python scripts/test_async_reads.py <import_session_id>   (Postgres only)
+    if len(sys.argv) < 2:
+        sys.exit("usage: python scripts/test_async_reads.py <import_session_id>")
+    import_session_id = int(sys.argv[1])
+
+    async_result = asyncio.run(run_async(import_session_id))
+    sync_result = run_sync(import_session_id)
+    if async_result != sync_result:
+        sys.exit("async and sync reads disagree")
+    print("async and sync reads match")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,46 @@
+import time
 from pathlib import Path
+
+import numpy as np
+
 from src.ai_model.blur_detector import BlurDetector
+from src.ai_model.preprocess import BLUR_SIDE
+from src.core.ai_review_manifest import DEFAULT_BLUR_THRESHOLD
 
 # Folder containing your test images
 IMAGE_FOLDER = Path("data/test_blur")
 
-# Initialize detector (adjust threshold if needed)
-detector = BlurDetector(threshold=70)
+# Former default, on full-resolution scores
+FULL_RES_THRESHOLD = 42.0
+
+# Full-resolution reference detector
+detector = BlurDetector(threshold=FULL_RES_THRESHOLD)
+
+
+def suggest_threshold(full: np.ndarray, reduced: np.ndarray, full_threshold: float) -> float | None:
+    """
+    Reduced-resolution cut that best reproduces the full-resolution warnings:
+    midpoint of the widest gap between sorted reduced scores with maximal agreement.
+    """
+    ok = ~(np.isnan(full) | np.isnan(reduced))
+    full, reduced = full[ok], reduced[ok]
+    if not full.size:
+        return None
+    order = np.argsort(reduced)
+    reduced, flagged = reduced[order], full[order] < full_threshold
+
+    # Cutting after the first k images flags exactly those k
+    agree = np.array([
+        np.count_nonzero(flagged[:k]) + np.count_nonzero(~flagged[k:])
+        for k in range(reduced.size + 1)
+    ])
+    best = None
+    for k in np.flatnonzero(agree == agree.max()):
+        lo = reduced[k - 1] if k > 0 else 0.0
+        hi = reduced[k] if k < reduced.size else reduced[-1] * 1.1
+        if best is None or hi - lo > best[1] - best[0]:
+            best = (lo, hi)
+    return (best[0] + best[1]) / 2
 
 def main():
     if not IMAGE_FOLDER.exists():
@@ -16,20 +51,42 @@ def main():
     print("Blur Detection Test")
     print("=" * 60)
 
-    for img_path in sorted(IMAGE_FOLDER.iterdir()):
-        if img_path.suffix.lower() not in [".jpg", ".jpeg", ".png"]:
-            continue
+    image_paths = [
+        p for p in sorted(IMAGE_FOLDER.iterdir())
+        if p.suffix.lower() in [".jpg", ".jpeg", ".png"]
+    ]
+
+    # Score the AI review manifest uses (reduced resolution), all cores
+    start = time.perf_counter()
+    reduced = detector.detect_many(image_paths)
+    elapsed = time.perf_counter() - start
 
+    full = np.full(len(image_paths), np.nan)
+    for i, (img_path, reduced_row) in enumerate(zip(image_paths, reduced)):
         try:
             result = detector.detect(img_path)
+            full[i] = result["blur_score"]
 
             print(f"{img_path.name}")
             print(f"  Blur Score   : {result['blur_score']:.2f}")
             print(f"  Blur Warning : {'YES' if result['blur_warning'] else 'NO'}")
+            print(f"  Score @{BLUR_SIDE}px : {reduced_row['blur_score']:.2f}")
+            print(f"  Warning @{BLUR_SIDE}px : {'YES' if reduced_row['blur_score'] < DEFAULT_BLUR_THRESHOLD else 'NO'}")
             print("-" * 60)
 
         except Exception as e:
             print(f"{img_path.name} -> ERROR: {e}")
 
+    scores = reduced["blur_score"][~np.isnan(reduced["blur_score"])]
+    if scores.size:
+        p10, p50, p90 = np.percentile(scores, [10, 50, 90])
+        print(f"@{BLUR_SIDE}px over {scores.size} images ({elapsed:.2f}s): "
+              f"p10={p10:.2f} p50={p50:.2f} p90={p90:.2f}")
+
+    suggested = suggest_threshold(full, reduced["blur_score"], FULL_RES_THRESHOLD)
+    if suggested is not None:
+        print(f"AI_BLUR_THRESHOLD matching full-res {FULL_RES_THRESHOLD:g}: {suggested:.0f} "
+              f"(current {DEFAULT_BLUR_THRESHOLD:g})")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
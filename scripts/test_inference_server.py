@@ -0,0 +1,45 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.ai_model.inference_server import DEFAULT_SOCKET_PATH, InferenceClient
+from src.ai_model.preprocess import decode_reduced
+from src.config import Config
+
+
+def main() -> None:
+    model_path = Path("src/ai_model/best_angle_classifier_2.pt")
+    image_dir = Path("data/test_batch")
+    socket_path = Config.AI_INFERENCE_SOCKET or DEFAULT_SOCKET_PATH
+    # Usage: python scripts/test_inference_server.py [clients]
+    # Start the server first: python -m src.ai_model.inference_server --verbose
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    client = InferenceClient(model_path, socket_path)
+    print("server model:", client.info())
+
+    images = [decode_reduced(p).bgr for p in sorted(image_dir.glob("*.*"))]
+    if not images:
+        print(f"No images in {image_dir}")
+        return
+
+    # Each thread plays one web worker sending small batches; the server log
+    # (--verbose) shows how they are coalesced
+    def run() -> None:
+        client.predict_batch(images, batch_size=4)
+
+    threads = [threading.Thread(target=run) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = clients * len(images)
+    print(f"{clients} clients x {len(images)} images: {elapsed:.2f}s ({total / elapsed:.1f} img/s)")
+
+
+if __name__ == "__main__":
+    main()
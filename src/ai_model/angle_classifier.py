@@ -1,28 +1,32 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence
 
-from ultralytics import YOLO
+import numpy as np
+
+
+# Images per model call; tune for CPU throughput (AI_BATCH_SIZE for the review manifest)
+DEFAULT_BATCH_SIZE = 16
 
 
 class AngleClassifier:
     def __init__(self, model_path: str | Path) -> None:
+        # Imported here so ONNX-only stations never load Torch
+        from ultralytics import YOLO
+
         self.model_path = str(model_path)
         self.model = YOLO(self.model_path)
+        # One instance is shared across request threads; YOLO predictors are not thread-safe
+        self._predict_lock = threading.Lock()
 
     @staticmethod
     def _parse_class_name(class_name: str) -> tuple[str, str]:
         obj, angle = class_name.rsplit("_", 1)
         return obj, angle
 
-    def predict(self, image_path: str | Path) -> Dict[str, Any]:
-        results = self.model.predict(source=str(image_path), imgsz=224, verbose=False)
-
-        if not results:
-            raise RuntimeError("No prediction results returned.")
-
-        r = results[0]
+    def _parse_result(self, r) -> Dict[str, Any]:
         if r.probs is None:
             raise RuntimeError("No classification probabilities returned.")
 
@@ -36,4 +40,40 @@ class AngleClassifier:
             "object": obj,
             "angle": angle,
             "confidence": confidence,
-        }
\ No newline at end of file
+        }
+
+    def predict(self, image: str | Path | np.ndarray) -> Dict[str, Any]:
+        """image: path, or a decoded BGR array (e.g. from preprocess.decode_reduced)."""
+        source = str(image) if isinstance(image, (str, Path)) else image
+        with self._predict_lock:
+            results = self.model.predict(source=source, imgsz=224, verbose=False)
+
+        if not results:
+            raise RuntimeError("No prediction results returned.")
+
+        return self._parse_result(results[0])
+
+    def predict_batch(
+        self,
+        sources: Sequence[str | Path | np.ndarray],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify many images, batch_size per model call. Results are in input order.
+        sources: image paths or decoded BGR arrays (as cv2.imread returns them).
+        Raises if any image in a batch fails; callers wanting per-image errors
+        should fall back to predict() for that batch.
+        """
+        batch_size = max(int(batch_size), 1)
+        out: List[Dict[str, Any]] = []
+
+        for i in range(0, len(sources), batch_size):
+            chunk = [str(s) if isinstance(s, (str, Path)) else s for s in sources[i:i + batch_size]]
+            with self._predict_lock:
+                results = self.model.predict(source=chunk, imgsz=224, verbose=False)
+
+            if len(results) != len(chunk):
+                raise RuntimeError(f"Expected {len(chunk)} prediction results, got {len(results)}.")
+            out.extend(self._parse_result(r) for r in results)
+
+        return out
@@ -26,10 +26,45 @@ This is a soft warning only. Operators remain the final authority.
 
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
 
 import cv2
+import numpy as np
+
+from src.ai_model.preprocess import BLUR_SIDE, decode_gray
+
+
+# Structured result of BlurDetector.detect_many, one record per input path
+BLUR_RESULT_DTYPE = np.dtype([("blur_score", np.float64), ("blur_warning", np.bool_)])
+
+
+def laplacian_variance(gray: np.ndarray, *, float32: bool = False) -> float:
+    """Variance of Laplacian. float32 halves memory traffic; the variance is still accumulated in double."""
+    lap = cv2.Laplacian(gray, cv2.CV_32F if float32 else cv2.CV_64F)
+    _, std = cv2.meanStdDev(lap)
+    return float(std[0, 0]) ** 2
+
+
+def _init_blur_worker() -> None:
+    # One OpenCV thread per process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+
+
+def _score_file(job: tuple[str, int | None, bool]) -> float:
+    path, side, float32 = job
+    try:
+        if side:
+            gray = decode_gray(path, side)
+        else:
+            gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                return float("nan")
+        return laplacian_variance(gray, float32=float32)
+    except Exception:
+        return float("nan")
 
 
 class BlurDetector:
@@ -66,9 +101,60 @@ class BlurDetector:
             raise RuntimeError(f"Failed to load image for blur detection: {image_path}")
         
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blur_score = float(cv2.Laplacian(gray, cv2.CV_64F).var())
+        return self.detect_gray(gray)
+
+    def detect_gray(self, gray: np.ndarray) -> Dict[str, Any]:
+        """
+        Same as detect() for an already decoded grayscale image, e.g. the
+        fixed-resolution image from src.ai_model.preprocess.decode_reduced.
+        Scores depend on the image resolution, so the threshold must be
+        calibrated at the resolution used here.
+        """
+        blur_score = laplacian_variance(gray)
 
         return {
             "blur_score": round(blur_score, 6),
             "blur_warning": blur_score < self.threshold,
-        }
\ No newline at end of file
+        }
+
+    def detect_many(
+        self,
+        image_paths: Sequence[str | Path],
+        *,
+        workers: int | None = None,
+        side: int | None = BLUR_SIDE,
+        float32: bool = True,
+        chunksize: int = 8,
+    ) -> np.ndarray:
+        """
+        Score many images across a process pool (bulk checks, threshold
+        studies, re-scoring history).
+
+        Args:
+            workers:
+                Processes to use (default: all cores). 1 scores in-process.
+            side:
+                Score on grayscale scaled to this many px on the longest side
+                (cost independent of camera resolution; same scale as the AI
+                review manifest). None scores at full resolution like detect().
+            float32:
+                Compute the Laplacian in float32 instead of float64.
+
+        Returns:
+            Array of BLUR_RESULT_DTYPE records in input order. Unreadable
+            images get blur_score NaN and blur_warning False.
+        """
+        jobs = [(str(p), side, float32) for p in image_paths]
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1 or len(jobs) < 2:
+            scores = [_score_file(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_blur_worker) as pool:
+                scores = list(pool.map(_score_file, jobs, chunksize=max(int(chunksize), 1)))
+
+        results = np.zeros(len(jobs), dtype=BLUR_RESULT_DTYPE)
+        results["blur_score"] = scores
+        with np.errstate(invalid="ignore"):
+            results["blur_warning"] = results["blur_score"] < self.threshold
+        return results
@@ -0,0 +1,353 @@
+"""
+Local inference server for the angle classifier.
+
+Purpose:
+--------
+Without it, every web worker that builds an AI review manifest loads its own
+copy of Torch and the model, and concurrent builds from several operators
+compete for the same cores. This process owns the models instead; web
+workers become clients over a Unix socket (set AI_INFERENCE_SOCKET).
+
+    python -m src.ai_model.inference_server [--socket data/ai_review/inference.sock]
+        [--model src/ai_model/best_angle_classifier_2.pt] [--threads 8]
+        [--max-batch 32] [--max-wait-ms 10]
+
+Dynamic batching:
+-----------------
+Requests for the same model from all connections go onto one queue. A
+batcher thread takes the first waiting request, then keeps collecting until
+--max-batch images are queued or --max-wait-ms has passed, and runs them as
+one predict_batch call. Under load this turns several small concurrent
+requests into full batches; an idle server adds at most --max-wait-ms.
+
+Threads:
+--------
+Torch intra-op threads are pinned to --threads and ONNX Runtime sessions
+use the same count, so the server never oversubscribes the CPU. Web workers
+keep decoding and blur scoring, which is single-threaded.
+
+Protocol:
+---------
+multiprocessing.connection over AF_UNIX, authenticated with SECRET_KEY.
+Requests and replies are pickled dicts; images travel as the reduced BGR
+arrays the manifest already decodes (or as file paths). Unpickling runs code,
+so the handshake is the only protection: server and clients refuse to use
+the development default SECRET_KEY.
+
+Models are loaded through the model registry on first request (or at start
+with --model) and reloaded when their file changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from src.ai_model.angle_classifier import DEFAULT_BATCH_SIZE
+from src.config import DEV_SECRET_KEY, Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = Path("data/ai_review/inference.sock")
+
+
+class InferenceUnavailableError(RuntimeError):
+    """The inference server could not be reached."""
+
+
+def _authkey() -> bytes:
+    if not Config.SECRET_KEY or Config.SECRET_KEY == DEV_SECRET_KEY:
+        raise InferenceUnavailableError(
+            "SECRET_KEY is not set: the inference server exchanges pickled data and "
+            "must not run with the development default key"
+        )
+    return Config.SECRET_KEY.encode()
+
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class _Request:
+    images: list
+    done: threading.Event = field(default_factory=threading.Event)
+    results: list | None = None
+    error: Exception | None = None
+
+
+class _Batcher:
+    """Coalesces requests for one model into batches of up to max_batch images."""
+
+    def __init__(self, model_path: str, *, max_batch: int, max_wait: float) -> None:
+        self.model_path = model_path
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: queue.Queue[_Request] = queue.Queue()
+        threading.Thread(target=self._run, name=f"batcher:{Path(model_path).name}", daemon=True).start()
+
+    def submit(self, images: list) -> list:
+        request = _Request(images=images)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    def _collect(self) -> list[_Request]:
+        first = self._queue.get()
+        requests = [first]
+        count = len(first.images)
+        deadline = time.monotonic() + self.max_wait
+
+        while count < self.max_batch:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            requests.append(request)
+            count += len(request.images)
+        return requests
+
+    def _predict(self, images: list) -> list:
+        from src.ai_model.model_registry import registry
+
+        return registry.get(self.model_path).model.predict_batch(images, batch_size=self.max_batch)
+
+    def _run(self) -> None:
+        while True:
+            requests = self._collect()
+            images = [image for r in requests for image in r.images]
+            start = time.perf_counter()
+
+            try:
+                preds = self._predict(images)
+            except Exception as e:
+                if len(requests) == 1:
+                    requests[0].error = e
+                else:
+                    # One bad image must not fail the other clients' requests
+                    for r in requests:
+                        try:
+                            r.results = self._predict(r.images)
+                        except Exception as single_error:
+                            r.error = single_error
+            else:
+                offset = 0
+                for r in requests:
+                    r.results = preds[offset:offset + len(r.images)]
+                    offset += len(r.images)
+
+            logger.debug(
+                "batch of %d images from %d requests in %.1f ms",
+                len(images), len(requests), 1000 * (time.perf_counter() - start),
+            )
+            for r in requests:
+                r.done.set()
+
+
+class InferenceServer:
+    def __init__(
+        self,
+        socket_path: str | Path = DEFAULT_SOCKET_PATH,
+        *,
+        max_batch: int = Config.AI_INFERENCE_MAX_BATCH,
+        max_wait_ms: float = Config.AI_INFERENCE_MAX_WAIT_MS,
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000
+        self._batchers: dict[str, _Batcher] = {}
+        self._batchers_lock = threading.Lock()
+
+    @staticmethod
+    def _model_key(model_path: str) -> str:
+        return str(Path(model_path).resolve(strict=False))
+
+    def _batcher(self, model_path: str) -> _Batcher:
+        key = self._model_key(model_path)
+        with self._batchers_lock:
+            batcher = self._batchers.get(key)
+            if batcher is None:
+                batcher = _Batcher(key, max_batch=self.max_batch, max_wait=self.max_wait)
+                self._batchers[key] = batcher
+            return batcher
+
+    def _info(self, model_path: str) -> dict:
+        from src.ai_model.model_registry import registry
+
+        key = self._model_key(model_path)
+        # Called once per manifest build, so a retrained model is picked up at the next build
+        registry.reload_if_changed(key)
+        loaded = registry.get(key)
+        return {"path": loaded.path, "stamp": loaded.stamp, "backend": type(loaded.model).__name__}
+
+    def _handle(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "info":
+            return {"ok": True, **self._info(request["model"])}
+        if op == "predict":
+            return {"ok": True, "results": self._batcher(request["model"]).submit(request["images"])}
+        return {"ok": False, "error": f"Unknown op: {op!r}"}
+
+    def _serve_connection(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = self._handle(request)
+                except Exception as e:
+                    reply = {"ok": False, "error": str(e)}
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+
+    def serve_forever(self) -> None:
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # A socket file left by a crashed server would make bind() fail
+        self.socket_path.unlink(missing_ok=True)
+
+        with Listener(str(self.socket_path), family="AF_UNIX", authkey=_authkey()) as listener:
+            os.chmod(self.socket_path, 0o600)
+            logger.info("inference server listening on %s", self.socket_path)
+            while True:
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    # A client with the wrong key must not stop the server
+                    logger.warning("rejected inference client: %s", e)
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+
+def pin_threads(threads: int) -> None:
+    """
+    Size Torch / ONNX Runtime thread pools; call before any model is loaded.
+    Torch reads OMP_NUM_THREADS when it is first imported, so ONNX-only
+    servers never have to import it here.
+    """
+    Config.AI_ONNX_THREADS = threads
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+
+class InferenceClient:
+    """
+    Angle classifier proxy with the same predict / predict_batch contract as
+    AngleClassifier, backed by the inference server. Safe to share between
+    threads; each thread gets its own connection.
+    """
+
+    def __init__(self, model_path: str | Path, socket_path: str | Path = DEFAULT_SOCKET_PATH) -> None:
+        # Absolute, so server and client agree on the model regardless of cwd
+        self.model_path = str(Path(model_path).resolve(strict=False))
+        self.socket_path = str(socket_path)
+        self._local = threading.local()
+
+    def _connect(self) -> Connection:
+        authkey = _authkey()
+        try:
+            return Client(self.socket_path, family="AF_UNIX", authkey=authkey)
+        except (OSError, EOFError, AuthenticationError) as e:
+            raise InferenceUnavailableError(f"Inference server not reachable at {self.socket_path} ({e})") from e
+
+    def _call(self, request: dict) -> dict:
+        # One retry on a fresh connection covers a server restart between calls
+        for attempt in range(2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            try:
+                conn.send(request)
+                reply = conn.recv()
+                break
+            except (OSError, EOFError) as e:
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise InferenceUnavailableError(f"Inference server connection lost ({e})") from e
+
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def info(self) -> dict:
+        """{"path", "stamp", "backend"} of the model as loaded by the server."""
+        return self._call({"op": "info", "model": self.model_path})
+
+    def predict(self, image: str | Path | np.ndarray) -> Dict[str, Any]:
+        return self.predict_batch([image])[0]
+
+    def predict_batch(
+        self,
+        sources: Sequence[str | Path | np.ndarray],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Same contract as AngleClassifier.predict_batch; the server may merge batches across clients."""
+        batch_size = max(int(batch_size), 1)
+        out: List[Dict[str, Any]] = []
+        for i in range(0, len(sources), batch_size):
+            chunk = [str(s) if isinstance(s, Path) else s for s in sources[i:i + batch_size]]
+            out.extend(self._call({"op": "predict", "model": self.model_path, "images": chunk})["results"])
+        return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local angle classifier inference server")
+    parser.add_argument("--socket", type=Path, default=Path(Config.AI_INFERENCE_SOCKET or DEFAULT_SOCKET_PATH))
+    parser.add_argument("--model", type=Path, action="append", default=[],
+                        help="model to load at start (repeatable); others load on first request")
+    parser.add_argument("--threads", type=int, default=Config.AI_INFERENCE_THREADS)
+    parser.add_argument("--max-batch", type=int, default=Config.AI_INFERENCE_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=Config.AI_INFERENCE_MAX_WAIT_MS)
+    parser.add_argument("--verbose", action="store_true", help="log every coalesced batch")
+    args = parser.parse_args()
+
+    try:
+        _authkey()
+    except InferenceUnavailableError as e:
+        parser.error(str(e))
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    pin_threads(args.threads)
+
+    from src.ai_model.model_registry import registry
+
+    for model_path in args.model:
+        registry.get(model_path)
+
+    InferenceServer(args.socket, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
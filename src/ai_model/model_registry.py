@@ -0,0 +1,132 @@
+"""
+Process-wide model registry.
+
+Loading a YOLO checkpoint takes seconds and hundreds of MB, so each model
+file is loaded at most once per process and shared by every request thread,
+script and worker that asks for it.
+
+The backend follows the file suffix: .onnx files load the ONNX Runtime
+classifier (no Torch in the process), anything else the Ultralytics one.
+
+Models are loaded lazily on first use. Replacing a .pt file on disk does not
+affect loaded models until reload() / reload_if_changed() is called (or the
+process restarts), so a half-copied file is never picked up mid-write.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+from src.ai_model.angle_classifier import AngleClassifier
+from src.config import Config
+
+if TYPE_CHECKING:
+    from src.ai_model.inference_server import InferenceClient
+    from src.ai_model.onnx_classifier import ONNXAngleClassifier
+
+logger = logging.getLogger(__name__)
+
+Classifier = Union[AngleClassifier, "ONNXAngleClassifier", "InferenceClient"]
+
+
+def model_file_stamp(model_path: str | Path) -> str:
+    """Size + mtime of a model file; changes when the file is replaced."""
+    try:
+        st = Path(model_path).stat()
+    except OSError:
+        return "missing"
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+@dataclass(frozen=True, slots=True)
+class LoadedModel:
+    model: Classifier
+    path: str
+    stamp: str
+
+
+class ModelRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: dict[str, LoadedModel] = {}
+
+    @staticmethod
+    def _key(model_path: str | Path) -> str:
+        return str(Path(model_path).resolve(strict=False))
+
+    def _load(self, key: str) -> LoadedModel:
+        # Stamp first: if the file changes while loading, the next reload_if_changed catches it
+        stamp = model_file_stamp(key)
+        if Path(key).suffix.lower() == ".onnx":
+            from src.ai_model.onnx_classifier import ONNXAngleClassifier
+
+            model = ONNXAngleClassifier(key)
+        else:
+            model = AngleClassifier(key)
+        loaded = LoadedModel(model=model, path=key, stamp=stamp)
+        self._models[key] = loaded
+        return loaded
+
+    def get(self, model_path: str | Path) -> LoadedModel:
+        """Loaded model for model_path, loading it on first use."""
+        key = self._key(model_path)
+        loaded = self._models.get(key)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            loaded = self._models.get(key)
+            if loaded is None:
+                loaded = self._load(key)
+            return loaded
+
+    def reload(self, model_path: str | Path) -> LoadedModel:
+        """Load model_path again; callers already holding the old model keep using it."""
+        key = self._key(model_path)
+        with self._lock:
+            return self._load(key)
+
+    def reload_if_changed(self, model_path: str | Path) -> bool:
+        """Reload model_path if it is loaded and its file changed since. Returns True if reloaded."""
+        key = self._key(model_path)
+        loaded = self._models.get(key)
+        if loaded is None or loaded.stamp == model_file_stamp(key):
+            return False
+        self.reload(key)
+        return True
+
+    def loaded(self) -> list[LoadedModel]:
+        return list(self._models.values())
+
+
+registry = ModelRegistry()
+
+
+def get_angle_classifier(model_path: str | Path) -> Classifier:
+    return registry.get(model_path).model
+
+
+def get_review_model(model_path: str | Path) -> LoadedModel:
+    """
+    Model for AI review: a client of the inference server when
+    Config.AI_INFERENCE_SOCKET is set (stamp as loaded by the server), else
+    the in-process model from the registry. A server that cannot be reached
+    falls back to the in-process model, so AI review keeps working (slower).
+    """
+    if not Config.AI_INFERENCE_SOCKET:
+        return registry.get(model_path)
+
+    from src.ai_model.inference_server import InferenceClient, InferenceUnavailableError
+
+    client = InferenceClient(model_path, Config.AI_INFERENCE_SOCKET)
+    try:
+        info = client.info()
+    except InferenceUnavailableError as e:
+        logger.warning("%s; loading %s in-process instead", e, model_path)
+        return registry.get(model_path)
+    return LoadedModel(model=client, path=info["path"], stamp=info["stamp"])
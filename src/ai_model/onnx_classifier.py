@@ -0,0 +1,114 @@
+"""
+ONNX Runtime backend for the angle classifier.
+
+Purpose:
+--------
+Same predict / predict_batch interface and class names as AngleClassifier,
+without Torch or Ultralytics in the process. Models come from
+src.ai_model.onnx_export (plain FP32 or int8-quantized).
+
+Preprocessing mirrors Ultralytics' classification predictor: RGB, shorter
+side resized to imgsz (PIL bilinear), center crop, scaled to [0, 1], NCHW.
+The exported graph ends in softmax, so outputs are class probabilities.
+
+Use `python -m src.ai_model.onnx_export check` to compare a converted model
+against the Torch checkpoint before switching a station over.
+"""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import onnxruntime as ort
+from PIL import Image, ImageOps
+
+from src.ai_model.angle_classifier import DEFAULT_BATCH_SIZE, AngleClassifier
+from src.config import Config
+
+
+def classify_input(image_rgb: np.ndarray, imgsz: int) -> np.ndarray:
+    """One HWC RGB uint8 image -> CHW float32 model input (Ultralytics classify_transforms)."""
+    h, w = image_rgb.shape[:2]
+    # torchvision Resize(int): shorter side -> imgsz, longer side truncated
+    if h <= w:
+        new_h, new_w = imgsz, int(imgsz * w / h)
+    else:
+        new_h, new_w = int(imgsz * h / w), imgsz
+    resized = np.asarray(Image.fromarray(image_rgb).resize((new_w, new_h), Image.BILINEAR))
+
+    top = int(round((new_h - imgsz) / 2.0))
+    left = int(round((new_w - imgsz) / 2.0))
+    crop = resized[top:top + imgsz, left:left + imgsz]
+
+    return np.ascontiguousarray(crop.transpose(2, 0, 1), dtype=np.float32) / 255.0
+
+
+def load_rgb(image: str | Path | np.ndarray) -> np.ndarray:
+    """Path (EXIF orientation applied, as cv2.imread does) or BGR array -> RGB array."""
+    if isinstance(image, (str, Path)):
+        with Image.open(image) as im:
+            return np.asarray(ImageOps.exif_transpose(im).convert("RGB"))
+    return np.ascontiguousarray(image[:, :, ::-1])
+
+
+class ONNXAngleClassifier:
+    def __init__(self, model_path: str | Path) -> None:
+        self.model_path = str(model_path)
+
+        options = ort.SessionOptions()
+        # Read per session so the inference server's pin_threads applies (0 = all physical cores)
+        options.intra_op_num_threads = Config.AI_ONNX_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # InferenceSession.run is thread-safe, so no predict lock is needed
+        self.session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        if "names" not in meta:
+            raise RuntimeError(f"ONNX model has no class names metadata: {self.model_path}")
+        self.names = {int(k): v for k, v in ast.literal_eval(meta["names"]).items()}
+        imgsz = ast.literal_eval(meta.get("imgsz", "224"))
+        self.imgsz = int(imgsz[0] if isinstance(imgsz, (list, tuple)) else imgsz)
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # Models exported without dynamic=True only take one image per run
+        self.max_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self.input_name: batch})[0]
+
+    def _parse_probs(self, probs: np.ndarray) -> Dict[str, Any]:
+        top1_idx = int(np.argmax(probs))
+        class_name = self.names[top1_idx]
+        obj, angle = AngleClassifier._parse_class_name(class_name)
+
+        return {
+            "class_name": class_name,
+            "object": obj,
+            "angle": angle,
+            "confidence": float(probs[top1_idx]),
+        }
+
+    def predict(self, image: str | Path | np.ndarray) -> Dict[str, Any]:
+        """image: path, or a decoded BGR array (e.g. from preprocess.decode_reduced)."""
+        batch = classify_input(load_rgb(image), self.imgsz)[None]
+        return self._parse_probs(self._run(batch)[0])
+
+    def predict_batch(
+        self,
+        sources: Sequence[str | Path | np.ndarray],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Same contract as AngleClassifier.predict_batch."""
+        batch_size = max(int(batch_size), 1)
+        if self.max_batch is not None:
+            batch_size = min(batch_size, self.max_batch)
+
+        out: List[Dict[str, Any]] = []
+        for i in range(0, len(sources), batch_size):
+            batch = np.stack([classify_input(load_rgb(s), self.imgsz) for s in sources[i:i + batch_size]])
+            out.extend(self._parse_probs(probs) for probs in self._run(batch))
+        return out
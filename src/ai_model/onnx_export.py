@@ -0,0 +1,214 @@
+"""
+Convert angle classifier checkpoints to ONNX for the ONNX Runtime backend.
+
+Usage:
+    python -m src.ai_model.onnx_export export   --pt src/ai_model/best_angle_classifier_2.pt
+    python -m src.ai_model.onnx_export quantize --onnx src/ai_model/best_angle_classifier_2.onnx \
+        --mode dynamic|static [--calib-dir data/archive] [--calib-count 200]
+    python -m src.ai_model.onnx_export check    --pt src/ai_model/best_angle_classifier_2.pt \
+        --onnx src/ai_model/best_angle_classifier_2.int8.onnx [--images data/archive] [--limit 200]
+
+export writes <name>.onnx next to the checkpoint (dynamic batch axis, class
+names and imgsz in the model metadata). quantize writes <name>.int8.onnx:
+"dynamic" quantizes weights only and needs no data; "static" also quantizes
+activations, calibrated on station archive images. check runs both backends
+on the same images (decoded exactly as the AI review manifest decodes them)
+and reports top-1 agreement, confidence drift and latency.
+
+Point AI_MODEL_PATH at the chosen .onnx file to switch a station's backend.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+def _image_paths(root: Path, limit: int) -> list[Path]:
+    """Up to `limit` images under root, spread evenly over the sorted listing."""
+    paths = sorted(p for p in root.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES)
+    if len(paths) > limit:
+        step = len(paths) / limit
+        paths = [paths[int(i * step)] for i in range(limit)]
+    return paths
+
+
+def export_onnx(pt_path: Path, *, imgsz: int = 224) -> Path:
+    from ultralytics import YOLO
+
+    out = YOLO(str(pt_path)).export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+    return Path(out)
+
+
+class _ArchiveCalibrationReader:
+    """Feeds preprocessed archive images to ONNX Runtime static quantization."""
+
+    def __init__(self, onnx_path: Path, image_paths: list[Path], batch_size: int = 8) -> None:
+        from src.ai_model.onnx_classifier import ONNXAngleClassifier, classify_input, load_rgb
+        from src.ai_model.preprocess import decode_reduced
+
+        clf = ONNXAngleClassifier(onnx_path)
+        self._input_name = clf.input_name
+        batches = []
+        for i in range(0, len(image_paths), batch_size):
+            chunk = [
+                classify_input(load_rgb(decode_reduced(p).bgr), clf.imgsz)
+                for p in image_paths[i:i + batch_size]
+            ]
+            batches.append(np.stack(chunk))
+        self._batches = iter(batches)
+
+    def get_next(self):
+        batch = next(self._batches, None)
+        return None if batch is None else {self._input_name: batch}
+
+
+def _copy_metadata(src: Path, dst: Path) -> None:
+    """Quantization drops custom metadata; the runtime needs names/imgsz."""
+    import onnx
+
+    source = onnx.load(str(src))
+    target = onnx.load(str(dst))
+    existing = {p.key for p in target.metadata_props}
+    for prop in source.metadata_props:
+        if prop.key not in existing:
+            target.metadata_props.add(key=prop.key, value=prop.value)
+    onnx.save(target, str(dst))
+
+
+def quantize_onnx(onnx_path: Path, *, mode: str, calib_dir: Path | None = None, calib_count: int = 200) -> Path:
+    from onnxruntime.quantization import (
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    out = onnx_path.with_name(f"{onnx_path.stem}.int8.onnx")
+    prepared = onnx_path.with_name(f"{onnx_path.stem}.prep.onnx")
+    # Plain ONNX shape inference is enough for a CNN; symbolic inference would need sympy
+    quant_pre_process(str(onnx_path), str(prepared), skip_symbolic_shape=True)
+
+    try:
+        if mode == "dynamic":
+            quantize_dynamic(str(prepared), str(out), weight_type=QuantType.QInt8)
+        else:
+            images = _image_paths(calib_dir, calib_count)
+            if not images:
+                raise RuntimeError(f"No calibration images found under {calib_dir}")
+            quantize_static(
+                str(prepared),
+                str(out),
+                _ArchiveCalibrationReader(onnx_path, images),
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                calibrate_method=CalibrationMethod.MinMax,
+            )
+    finally:
+        prepared.unlink(missing_ok=True)
+
+    _copy_metadata(onnx_path, out)
+    return out
+
+
+def check_backends(pt_path: Path, onnx_path: Path, image_paths: list[Path]) -> dict:
+    """Torch vs ONNX on the same decoded inputs."""
+    from src.ai_model.angle_classifier import AngleClassifier
+    from src.ai_model.onnx_classifier import ONNXAngleClassifier
+    from src.ai_model.preprocess import decode_reduced
+
+    torch_clf = AngleClassifier(pt_path)
+    onnx_clf = ONNXAngleClassifier(onnx_path)
+    images = [decode_reduced(p).bgr for p in image_paths]
+
+    # Warm-up so first-call setup does not count as latency
+    torch_clf.predict(images[0])
+    onnx_clf.predict(images[0])
+
+    start = time.perf_counter()
+    torch_preds = torch_clf.predict_batch(images)
+    torch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    onnx_preds = onnx_clf.predict_batch(images)
+    onnx_s = time.perf_counter() - start
+
+    agree = [t["class_name"] == o["class_name"] for t, o in zip(torch_preds, onnx_preds)]
+    drift = np.abs([t["confidence"] - o["confidence"] for t, o in zip(torch_preds, onnx_preds)])
+    return {
+        "images": len(images),
+        "top1_agreement": float(np.mean(agree)),
+        "confidence_drift_mean": float(drift.mean()),
+        "confidence_drift_max": float(drift.max()),
+        "torch_ms_per_image": 1000 * torch_s / len(images),
+        "onnx_ms_per_image": 1000 * onnx_s / len(images),
+        "disagreements": [
+            (str(p), t["class_name"], o["class_name"])
+            for p, t, o, ok in zip(image_paths, torch_preds, onnx_preds, agree)
+            if not ok
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ONNX export / quantization for the angle classifier")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_export = sub.add_parser("export", help="export a .pt checkpoint to ONNX")
+    p_export.add_argument("--pt", type=Path, required=True)
+    p_export.add_argument("--imgsz", type=int, default=224)
+
+    p_quant = sub.add_parser("quantize", help="int8-quantize an exported ONNX model")
+    p_quant.add_argument("--onnx", type=Path, required=True)
+    p_quant.add_argument("--mode", choices=("dynamic", "static"), default="dynamic")
+    p_quant.add_argument("--calib-dir", type=Path, default=Path("data/archive"))
+    p_quant.add_argument("--calib-count", type=int, default=200)
+
+    p_check = sub.add_parser("check", help="compare an ONNX model against the Torch checkpoint")
+    p_check.add_argument("--pt", type=Path, required=True)
+    p_check.add_argument("--onnx", type=Path, required=True)
+    p_check.add_argument("--images", type=Path, default=Path("data/archive"))
+    p_check.add_argument("--limit", type=int, default=200)
+    p_check.add_argument("--min-agreement", type=float, default=0.98,
+                         help="exit non-zero below this top-1 agreement")
+
+    args = parser.parse_args()
+
+    if args.cmd == "export":
+        print(f"exported {export_onnx(args.pt, imgsz=args.imgsz)}")
+
+    elif args.cmd == "quantize":
+        out = quantize_onnx(args.onnx, mode=args.mode, calib_dir=args.calib_dir, calib_count=args.calib_count)
+        print(f"quantized ({args.mode}) {out}")
+
+    elif args.cmd == "check":
+        images = _image_paths(args.images, args.limit)
+        if not images:
+            sys.exit(f"No images found under {args.images}")
+
+        report = check_backends(args.pt, args.onnx, images)
+        print(f"images:                 {report['images']}")
+        print(f"top-1 agreement:        {report['top1_agreement']:.2%}")
+        print(f"confidence drift mean:  {report['confidence_drift_mean']:.4f}")
+        print(f"confidence drift max:   {report['confidence_drift_max']:.4f}")
+        print(f"torch ms/image:         {report['torch_ms_per_image']:.1f}")
+        print(f"onnx ms/image:          {report['onnx_ms_per_image']:.1f}")
+        for path, torch_cls, onnx_cls in report["disagreements"]:
+            print(f"  {path}: torch={torch_cls} onnx={onnx_cls}")
+
+        if report["top1_agreement"] < args.min_agreement:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
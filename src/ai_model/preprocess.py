@@ -0,0 +1,99 @@
+"""
+Shared image preprocessing for AI review.
+
+Purpose:
+--------
+The classifier only needs a 224 px input and the blur metric a modest
+grayscale image, yet both used to decode the full 12-20 MP camera JPEG
+(Ultralytics once, cv2.imread again). Here each image is decoded once, with
+JPEG DCT scaling (PIL draft mode) so the decoder itself produces a reduced
+image, and the result feeds both consumers:
+
+- bgr  : reduced BGR array for AngleClassifier.predict / predict_batch
+- gray : grayscale resized to BLUR_SIDE px on the longest side for BlurDetector
+
+Non-JPEG files are decoded in full and then resized.
+
+NOTE:
+-----
+Blur scores computed on `gray` are on a fixed scale, independent of camera
+resolution, but are not numerically comparable to full-resolution scores.
+Thresholds must be calibrated against the same BLUR_SIDE
+(see scripts/test_blur_threshold.py).
+
+OpenCV is imported on first use: the web app imports this module (via the AI
+review manifest) and should start without loading it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Longest side of the grayscale image the blur metric is computed on
+BLUR_SIDE = 512
+
+# Smallest size the decoder may scale down to; covers the classifier's 224 px
+# input and BLUR_SIDE
+DECODE_MIN_SIDE = max(224, BLUR_SIDE)
+
+
+@dataclass(frozen=True, slots=True)
+class DecodedImage:
+    bgr: np.ndarray
+    gray: np.ndarray
+
+
+def preprocess_signature() -> str:
+    """Identifies these settings in cache keys and manifests."""
+    return f"pil-draft{DECODE_MIN_SIDE}/gray{BLUR_SIDE}"
+
+
+def fixed_gray(image: np.ndarray, side: int = BLUR_SIDE) -> np.ndarray:
+    """Grayscale copy of a BGR (or already gray) image, longest side scaled to `side`."""
+    import cv2
+
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape[:2]
+    scale = side / max(h, w)
+    if scale == 1:
+        return gray
+    interp = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    return cv2.resize(gray, (max(round(w * scale), 1), max(round(h * scale), 1)), interpolation=interp)
+
+
+def decode_reduced(image_path: str | Path) -> DecodedImage:
+    """Decode an image once at reduced resolution for both classifier and blur metric."""
+    image_path = str(image_path)
+    try:
+        with Image.open(image_path) as im:
+            # JPEG only: pick the smallest DCT scale (1/2, 1/4, 1/8) still >= DECODE_MIN_SIDE
+            im.draft("RGB", (DECODE_MIN_SIDE, DECODE_MIN_SIDE))
+            # Same orientation cv2.imread / Ultralytics would use
+            im = ImageOps.exif_transpose(im).convert("RGB")
+            rgb = np.asarray(im)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Failed to decode image: {image_path} ({e})") from e
+
+    bgr = np.ascontiguousarray(rgb[:, :, ::-1])
+    return DecodedImage(bgr=bgr, gray=fixed_gray(bgr))
+
+
+def decode_gray(image_path: str | Path, side: int = BLUR_SIDE) -> np.ndarray:
+    """
+    Grayscale only, longest side scaled to `side`, for bulk blur scoring.
+    JPEGs decode just the luma channel at reduced DCT scale.
+    """
+    image_path = str(image_path)
+    try:
+        with Image.open(image_path) as im:
+            im.draft("L", (side, side))
+            im = ImageOps.exif_transpose(im).convert("L")
+            gray = np.asarray(im)
+    except (OSError, ValueError) as e:
+        raise RuntimeError(f"Failed to decode image: {image_path} ({e})") from e
+
+    return fixed_gray(gray, side)
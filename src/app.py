@@ -5,12 +5,16 @@ from flask import Flask, redirect, url_for
 
 from src.config import Config
 from src.startup import ensure_directories
-from src.db.session import build_engine, init_session_factory
+from src.db.session import build_engine, build_read_engine, init_session_factory, init_read_session_factory
+from src.web.db_routing import mark_write_after_request
+from src.web.sql_stats import init_sql_stats
 from src.web.routes.decisions import bp as decisions_bp
 from src.web.routes.ingestion import bp as ingestion_bp
 from src.web.routes.auth import bp as auth_bp
 from src.web.routes.exports import bp as exports_bp
 from src.web.routes.sessions import bp as sessions_bp
+from src.web.routes.search import bp as search_bp
+from src.web.routes.analytics import bp as analytics_bp
 
 
 def create_app() -> Flask:
@@ -26,6 +30,11 @@ def create_app() -> Flask:
     # Init DB engine/session factory
     engine = build_engine(echo=False)
     init_session_factory(engine)
+    read_engine = build_read_engine(echo=False)
+    init_read_session_factory(read_engine)
+
+    # Per-request query counts / timing (Server-Timing header + log line)
+    init_sql_stats(app, engine, read_engine)
 
     # Init DB tables
     """
@@ -39,6 +48,10 @@ def create_app() -> Flask:
     app.register_blueprint(decisions_bp)
     app.register_blueprint(exports_bp)
     app.register_blueprint(sessions_bp)
+    app.register_blueprint(search_bp)
+    app.register_blueprint(analytics_bp)
+
+    app.after_request(mark_write_after_request)
 
     @app.after_request
     def add_no_cache_headers(response):
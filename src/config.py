@@ -7,9 +7,12 @@ from dotenv import load_dotenv
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 load_dotenv(PROJECT_ROOT / ".env", override=True)
 
+# Placeholder for development only; anything authenticated with it is unprotected
+DEV_SECRET_KEY = "dev-only-secret"
+
 
 class Config:
-    SECRET_KEY = os.getenv("SECRET_KEY", "dev-only-secret")
+    SECRET_KEY = os.getenv("SECRET_KEY", DEV_SECRET_KEY)
     FLASK_HOST = os.getenv("FLASK_HOST", "0.0.0.0")
     FLASK_PORT = int(os.getenv("FLASK_PORT", "5000"))
     FLASK_DEBUG = os.getenv("FLASK_DEBUG", "true").lower() == "true"
@@ -18,4 +21,47 @@ class Config:
     INCOMING_DIR = os.getenv("INCOMING_DIR", "./data/incoming")
     ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "./data/archive")
     EXPORT_DIR = os.getenv("EXPORT_DIR", "./data/exports")
-    AI_REVIEW_DIR = os.getenv("AI_REVIEW_DIR", "./data/ai_review")
\ No newline at end of file
+    AI_REVIEW_DIR = os.getenv("AI_REVIEW_DIR", "./data/ai_review")
+
+    # Read-only pages stay on the primary for this long after the operator writes,
+    # so replica lag never hides their own change.
+    READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "10"))
+
+    # Live decide-page updates: open streams per web process, and how long one
+    # stream lasts before the browser reconnects (each open stream holds a worker thread)
+    DECISION_EVENTS_MAX_LISTENERS = int(os.getenv("DECISION_EVENTS_MAX_LISTENERS", "16"))
+    DECISION_EVENTS_MAX_SECONDS = float(os.getenv("DECISION_EVENTS_MAX_SECONDS", "300"))
+
+    # Fail requests that exceed their @query_budget (for tests / CI)
+    SQL_STRICT_QUERY_BUDGET = os.getenv("SQL_STRICT_QUERY_BUDGET", "false").lower() == "true"
+
+    # Lifetime of cached operators, open jobs and session headers (0 disables)
+    REF_CACHE_TTL_SECONDS = float(os.getenv("REF_CACHE_TTL_SECONDS", "60"))
+
+    # Import sessions per media/decisions partition; changing it only affects new partitions
+    PARTITION_SESSION_SPAN = int(os.getenv("PARTITION_SESSION_SPAN", "1000"))
+
+    # SQLite edge mode connection tuning
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # AI review: model (.pt or exported .onnx), images per classifier call,
+    # concurrent manifest builds per process and the per-image result cache
+    AI_MODEL_PATH = os.getenv("AI_MODEL_PATH", "src/ai_model/best_angle_classifier_2.pt")
+    AI_BATCH_SIZE = int(os.getenv("AI_BATCH_SIZE", "16"))
+    AI_REVIEW_WORKERS = int(os.getenv("AI_REVIEW_WORKERS", "1"))
+    AI_RESULT_CACHE_PATH = os.getenv("AI_RESULT_CACHE_PATH", "data/ai_review/ai_results.sqlite3")
+
+    # Blur warning cut on the 512 px score; 1170 reproduces the old full-resolution
+    # cut of 42. Recalibrate on your own images with scripts/test_blur_threshold.py
+    AI_BLUR_THRESHOLD = float(os.getenv("AI_BLUR_THRESHOLD", "1170"))
+
+    # ONNX Runtime intra-op threads per loaded model (0 = all physical cores)
+    AI_ONNX_THREADS = int(os.getenv("AI_ONNX_THREADS", "0"))
+
+    # Local inference server: socket (unset = models load in-process), dynamic
+    # batching, and Torch / ONNX Runtime threads in the server (0 = all cores)
+    AI_INFERENCE_SOCKET = os.getenv("AI_INFERENCE_SOCKET", "")
+    AI_INFERENCE_MAX_BATCH = int(os.getenv("AI_INFERENCE_MAX_BATCH", "32"))
+    AI_INFERENCE_MAX_WAIT_MS = float(os.getenv("AI_INFERENCE_MAX_WAIT_MS", "10"))
+    AI_INFERENCE_THREADS = int(os.getenv("AI_INFERENCE_THREADS", "0")) or (os.cpu_count() or 1)
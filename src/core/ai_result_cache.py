@@ -0,0 +1,120 @@
+"""
+Persistent per-image AI result cache.
+
+Purpose:
+--------
+The decision page rebuilds the AI manifest on every load. Classifier and
+blur results for an image only change when the image bytes, the model or the
+blur threshold change, so they are cached on disk and reused.
+
+Keys:
+-----
+- Image identity : sha256 of the file content (survives moves to archive)
+- Model identity : model path + version + size/mtime of the loaded model file
+                   + preprocessing settings
+- Blur threshold : blur_warning depends on it
+
+Hashing every image on every load would cost almost as much as inference on
+large sessions, so the sha256 itself is memoised per (path, size, mtime_ns):
+a warm reload costs one stat() and one indexed lookup per image.
+
+Storage:
+--------
+A small SQLite file (stdlib sqlite3, WAL mode) next to the manifests, so
+every web worker on the station shares it. Delete the file to reset the cache.
+
+Like the manifest, cached results are advisory only.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.config import Config
+from src.utils.hashing import sha256_file
+
+AI_RESULT_CACHE_PATH = Path(Config.AI_RESULT_CACHE_PATH)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_digests (
+    path      TEXT    NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    sha256    TEXT    NOT NULL,
+    PRIMARY KEY (path, size, mtime_ns)
+);
+CREATE TABLE IF NOT EXISTS ai_results (
+    sha256          TEXT NOT NULL,
+    model_key       TEXT NOT NULL,
+    blur_threshold  REAL NOT NULL,
+    result          TEXT NOT NULL,
+    PRIMARY KEY (sha256, model_key, blur_threshold)
+);
+"""
+
+
+def model_cache_key(model_path: str | Path, model_version: str, file_stamp: str, preprocess: str) -> str:
+    """
+    Model identity. file_stamp is the size/mtime the loaded model was read with
+    (see src.ai_model.model_registry), so retraining into the same path still
+    gets a fresh key once the new file is loaded. preprocess identifies the
+    decode/resize settings, which change both classifier input and blur scores.
+    """
+    return f"{Path(model_path).resolve(strict=False)}|{model_version}|{file_stamp}|{preprocess}"
+
+
+class AIResultCache:
+    """
+    Cache of classifier + blur results for one (model, blur threshold) pair.
+    Safe to share between threads; each thread gets its own connection.
+    """
+
+    def __init__(self, *, model_key: str, blur_threshold: float, path: str | Path = AI_RESULT_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.model_key = model_key
+        self.blur_threshold = float(blur_threshold)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def file_digest(self, image_path: Path) -> str:
+        """sha256 of the file, hashed only when the file is new or has changed."""
+        st = image_path.stat()
+        key = (str(image_path), st.st_size, st.st_mtime_ns)
+        conn = self._conn()
+
+        row = conn.execute(
+            "SELECT sha256 FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ?", key
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = sha256_file(image_path)
+        conn.execute("INSERT OR REPLACE INTO file_digests VALUES (?, ?, ?, ?)", (*key, digest))
+        return digest
+
+    def get(self, digest: str) -> dict[str, Any] | None:
+        row = self._conn().execute(
+            "SELECT result FROM ai_results WHERE sha256 = ? AND model_key = ? AND blur_threshold = ?",
+            (digest, self.model_key, self.blur_threshold),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, digest: str, result: dict[str, Any]) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO ai_results VALUES (?, ?, ?, ?)",
+            (digest, self.model_key, self.blur_threshold, json.dumps(result)),
+        )
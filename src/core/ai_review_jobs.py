@@ -0,0 +1,77 @@
+"""
+Background AI review manifest builds.
+
+The decision page renders straight from the database and whatever manifest is
+already on disk, then asks for a build here. Builds run on a small per-process
+thread pool; a second request for a session that is already building attaches
+to the running build instead of starting another one. Workers in other
+processes are kept out by the per-session "manifest" lock.
+
+Progress is published through the manifest file itself: the builder rewrites
+it (atomically) after every inference batch, so any web worker can serve the
+partial results to a polling page.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.config import Config
+from src.core.ai_review_manifest import AIReviewManifestError, AIReviewManifestService
+from src.db.session import SessionLocal
+from src.db.session_locks import SessionBusyError
+
+# Concurrent manifest builds per process (inference is CPU bound)
+AI_REVIEW_WORKERS = Config.AI_REVIEW_WORKERS
+
+# Finished builds remembered for status polling before being pruned
+_MAX_FINISHED_JOBS = 256
+
+_executor = ThreadPoolExecutor(max_workers=max(AI_REVIEW_WORKERS, 1), thread_name_prefix="ai-review")
+_jobs: dict[int, Future] = {}
+_jobs_lock = threading.Lock()
+
+
+def _build(import_session_id: int) -> None:
+    service = AIReviewManifestService()
+    # Primary, not the replica: the page usually loads right after a write
+    with SessionLocal() as db:
+        service.build_and_write_manifest(db, import_session_id)
+
+
+def _prune_finished() -> None:
+    finished = [sid for sid, job in _jobs.items() if job.done()]
+    for sid in finished[: max(len(finished) - _MAX_FINISHED_JOBS, 0)]:
+        del _jobs[sid]
+
+
+def start_manifest_build(import_session_id: int) -> None:
+    """Queue a manifest build for the session unless one is already queued or running here."""
+    with _jobs_lock:
+        job = _jobs.get(import_session_id)
+        if job is not None and not job.done():
+            return
+        _prune_finished()
+        _jobs[import_session_id] = _executor.submit(_build, import_session_id)
+
+
+def manifest_build_state(import_session_id: int) -> tuple[str, str | None]:
+    """
+    State of this process's latest build for the session:
+      ("idle", None)     no build here, or it finished (or another worker holds the lock)
+      ("running", None)  queued or running here
+      ("failed", error)  the latest build here raised
+    """
+    job = _jobs.get(import_session_id)
+    if job is None:
+        return "idle", None
+    if not job.done():
+        return "running", None
+
+    exc = job.exception()
+    if exc is None or isinstance(exc, SessionBusyError):
+        return "idle", None
+    if isinstance(exc, AIReviewManifestError):
+        return "failed", str(exc)
+    return "failed", f"AI review unavailable: {exc}"
@@ -25,41 +25,57 @@ data/ai_review/session_<import_session_id>_ai_review.json
 Lifecycle:
 ----------
 - Generated during decision page load
-- Overwritten on each regeneration
+- Regenerated incrementally: media unchanged since the previous manifest
+  (same file path/size/mtime, model and blur threshold) keep their stored
+  result; session-level flags are always recomputed. Written atomically.
+- Per-image results are reused from the AI result cache
+  (src/core/ai_result_cache.py) until the image, model or blur threshold changes
 - Not included in export pipeline
 """
 
 from __future__ import annotations
 
 import json
+import os
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.ai_model.angle_classifier import AngleClassifier
+from src.ai_model.model_registry import LoadedModel, get_review_model
+from src.ai_model.preprocess import BLUR_SIDE, DecodedImage, decode_reduced, preprocess_signature
 from src.ai_model.angle_suggester import REQUIRED_ANGLES, suggest_next_angles
-from src.ai_model.blur_detector import BlurDetector
-from src.db.models import ImportSession, Media, Decisions
+from src.config import Config
+from src.core.ai_result_cache import AIResultCache, model_cache_key
+from src.db.models import Media, Decisions
+from src.db.ref_cache import get_session_header
+from src.db.session_locks import session_lock
 
 
 # Directory for storing AI manifest files
 AI_REVIEW_DIR = Path("data/ai_review")
 
-# Default model configuration (can be externalized later)
-DEFAULT_MODEL_PATH = Path("src/ai_model/best_angle_classifier_2.pt")
+# Default model configuration; AI_MODEL_PATH may point at a .pt or an exported .onnx
+DEFAULT_MODEL_PATH = Path(Config.AI_MODEL_PATH)
 DEFAULT_MODEL_NAME = "angle_classifier"
 DEFAULT_MODEL_VERSION = "v1"
 
-# Default blur config 
-DEFAULT_BLUR_THRESHOLD = 42
+# Media rows fetched per round trip while building a manifest
+ROW_CHUNK_SIZE = 500
 
+# Images per classifier call; tune for CPU throughput
+AI_BATCH_SIZE = Config.AI_BATCH_SIZE
 
-@dataclass(frozen=True)
+# Default blur config (score at preprocess.BLUR_SIDE px, see Config.AI_BLUR_THRESHOLD)
+DEFAULT_BLUR_THRESHOLD = Config.AI_BLUR_THRESHOLD
+
+
+@dataclass(frozen=True, slots=True)
 class AIReviewMediaRow:
     """
     Lightweight representation of media data for AI processing.
@@ -99,14 +115,48 @@ class AIReviewManifestService:
         model_name: str = DEFAULT_MODEL_NAME,
         model_version: str = DEFAULT_MODEL_VERSION,
         blur_threshold: float = DEFAULT_BLUR_THRESHOLD,
+        result_cache: AIResultCache | None = None,
+        batch_size: int = AI_BATCH_SIZE,
     ) -> None:
         self.model_path = Path(model_path)
         self.model_name = model_name
         self.model_version = model_version
         self.blur_threshold = float(blur_threshold)
-        # Load YOLO classifier once (expensive operation)
-        self.classifier = AngleClassifier(self.model_path)
-        self.blur_detector = BlurDetector(threshold=self.blur_threshold)
+        self.batch_size = max(int(batch_size), 1)
+        self._result_cache = result_cache
+
+    # Model, blur detector and cache are set up on first use, i.e. inside
+    # build_and_write_manifest's session lock: a worker that loses the lock
+    # race never loads a model or contacts the inference server.
+
+    @cached_property
+    def _loaded_model(self) -> LoadedModel:
+        # YOLO classifier is loaded once per process and shared (expensive operation),
+        # or lives in the inference server when AI_INFERENCE_SOCKET is set
+        return get_review_model(self.model_path)
+
+    @property
+    def classifier(self):
+        return self._loaded_model.model
+
+    @cached_property
+    def blur_detector(self):
+        # Imported here so the web app can import this module without loading OpenCV
+        from src.ai_model.blur_detector import BlurDetector
+
+        return BlurDetector(threshold=self.blur_threshold)
+
+    @cached_property
+    def result_cache(self) -> AIResultCache:
+        if self._result_cache is not None:
+            return self._result_cache
+        return AIResultCache(
+            model_key=model_cache_key(
+                self.model_path, self.model_version, self._loaded_model.stamp, preprocess_signature()
+            ),
+            blur_threshold=self.blur_threshold,
+        )
+
     # -------------------------------------------------------------------------
     # Utility Helpers
     # -------------------------------------------------------------------------
@@ -198,41 +248,50 @@ class AIReviewManifestService:
     # -------------------------------------------------------------------------
 
     @staticmethod
-    def _load_rows(db: Session, import_session_id: int):
+    def _rows_stmt(import_session_id: int):
+        """Column projection only; field order matches AIReviewMediaRow."""
+        return (
+            select(
+                Media.media_id,
+                Media.filename,
+                Media.local_path,
+                Media.captured_at,
+                Decisions.status,
+            )
+            .outerjoin(
+                Decisions,
+                (Decisions.media_id == Media.media_id)
+                & (Decisions.import_session_id == Media.import_session_id),
+            )
+            .where(Media.import_session_id == import_session_id)
+            .order_by(Media.captured_at.asc().nulls_last(), Media.media_id.asc())
+        )
+
+    @staticmethod
+    def _load_rows(db: Session, import_session_id: int, *, chunk_size: int | None = None):
         """
         Load session + media rows.
 
         IMPORTANT:
         We join Decisions ONLY to expose operator decision state,
         not to influence AI results.
+
+        chunk_size: when set, rows are returned as a generator streamed from
+        a server-side cursor instead of a list.
         """
 
-        session_row = db.scalar(
-            select(ImportSession).where(ImportSession.import_session_id == import_session_id)
-        )
+        session_row = get_session_header(db, import_session_id)
         if not session_row:
             raise AIReviewManifestError(f"ImportSession not found: {import_session_id}")
 
-        stmt = (
-            select(Media, Decisions)
-            .outerjoin(Decisions, Decisions.media_id == Media.media_id)
-            .where(Media.import_session_id == import_session_id)
-            .order_by(Media.captured_at.asc().nulls_last(), Media.media_id.asc())
-        )
+        stmt = AIReviewManifestService._rows_stmt(import_session_id)
 
-        rows = []
-        for media, decision in db.execute(stmt).all():
-            rows.append(
-                AIReviewMediaRow(
-                    media_id=media.media_id,
-                    filename=media.filename,
-                    local_path=media.local_path,
-                    captured_at=media.captured_at,
-                    decision_status=(decision.status if decision else None),
-                )
-            )
+        if chunk_size is None:
+            rows = [AIReviewMediaRow(*row) for row in db.execute(stmt).all()]
+            return session_row, rows
 
-        return session_row, rows
+        result = db.execute(stmt.execution_options(yield_per=chunk_size))
+        return session_row, (AIReviewMediaRow(*row) for row in result)
 
     # -------------------------------------------------------------------------
     # Duplicate Detection
@@ -267,28 +326,137 @@ class AIReviewManifestService:
             seen[key] += 1
             item["duplicate_warning"] = counts[key] > 1 and seen[key] > 1
 
+    # -------------------------------------------------------------------------
+    # Inference
+    # -------------------------------------------------------------------------
+
+    def _infer_one(self, image: DecodedImage, pred: dict | None = None) -> dict:
+        if pred is None:
+            pred = self.classifier.predict(image.bgr)
+        blur = self.blur_detector.detect_gray(image.gray)
+        return {
+            "class_name": pred["class_name"],
+            "object": pred["object"],
+            "angle": pred["angle"],
+            "confidence": round(float(pred["confidence"]), 6),
+            "blur_score": blur["blur_score"],
+            "blur_warning": blur["blur_warning"],
+        }
+
+    def _infer_batch(self, paths: list[Path]) -> list[dict | Exception]:
+        """
+        Classifier + blur results for paths, in order. Each image is decoded
+        once at reduced resolution and shared by both. One bad image fails its
+        whole classifier batch, so that batch is retried image by image to
+        keep errors per image.
+        """
+        out: list[dict | Exception | None] = [None] * len(paths)
+        decoded: list[tuple[int, DecodedImage]] = []
+        for i, path in enumerate(paths):
+            try:
+                decoded.append((i, decode_reduced(path)))
+            except Exception as e:
+                out[i] = e
+
+        try:
+            preds = self.classifier.predict_batch([image.bgr for _, image in decoded], batch_size=len(paths))
+        except Exception:
+            preds = [None] * len(decoded)
+
+        for (i, image), pred in zip(decoded, preds):
+            try:
+                out[i] = self._infer_one(image, pred)
+            except Exception as e:
+                out[i] = e
+        return out
+
+    @staticmethod
+    def _source_fingerprint(path: Path) -> dict:
+        """Identifies the exact file a result was computed from."""
+        st = path.stat()
+        return {"path": str(path), "size_bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    @staticmethod
+    def _result_item(row: AIReviewMediaRow, ai: dict, source: dict) -> dict:
+        return {
+            "media_id": row.media_id,
+            "filename": row.filename,
+            "predicted_class": ai["class_name"],
+            "predicted_object": ai["object"],
+            "predicted_angle": ai["angle"],
+            "confidence": ai["confidence"],
+            "blur_score": ai["blur_score"],
+            "blur_warning": ai["blur_warning"],
+            "duplicate_warning": False,
+            "target_mismatch_warning": False,
+            "error": None,
+            "source": source,
+        }
+
+    @staticmethod
+    def _ai_from_item(item: dict) -> dict:
+        """Per-image result fields of a previous manifest entry (session-level flags are recomputed)."""
+        return {
+            "class_name": item["predicted_class"],
+            "object": item["predicted_object"],
+            "angle": item["predicted_angle"],
+            "confidence": item["confidence"],
+            "blur_score": item["blur_score"],
+            "blur_warning": item["blur_warning"],
+        }
+
+    @staticmethod
+    def _error_item(row: AIReviewMediaRow, error: str) -> dict:
+        return {
+            "media_id": row.media_id,
+            "filename": row.filename,
+            "predicted_class": None,
+            "predicted_object": None,
+            "predicted_angle": None,
+            "confidence": None,
+            "blur_score": None,
+            "blur_warning": False,
+            "duplicate_warning": False,
+            "target_mismatch_warning": False,
+            "error": error,
+        }
+
     # -------------------------------------------------------------------------
     # Core Manifest Builder
     # -------------------------------------------------------------------------
 
-    def build_manifest(self, db: Session, import_session_id: int) -> dict:
+    def build_manifest(
+        self,
+        db: Session,
+        import_session_id: int,
+        *,
+        on_progress: Callable[[dict], None] | None = None,
+    ) -> dict:
         """
         Main entry point.
 
         Steps:
         1. Load session + media
-        2. Run AI prediction per image
+        2. Reuse unchanged results from the previous manifest; run AI
+           prediction on the rest (result cache, then batched inference)
         3. Aggregate session coverage
         4. Build structured JSON
+
+        on_progress, if given, receives a partial manifest (status "running")
+        once reused/cached results are known and again after every inference
+        batch, so callers can publish results as they are produced.
         """
 
-        session_row, rows = self._load_rows(db, import_session_id)
+        session_row, rows = self._load_rows(db, import_session_id, chunk_size=ROW_CHUNK_SIZE)
+        total_media = 0
 
-        captured_by_object = defaultdict(set)
-        object_counter = Counter()
+        previous = self._load_previous_results(import_session_id)
         media_results = []
+        # Cache misses waiting for inference: (index in media_results, row, source, path, digest)
+        pending = []
 
         for row in rows:
+            total_media += 1
             resolved = self._find_existing_media_path(
                 uut_serial=session_row.uut_serial,
                 import_session_id=session_row.import_session_id,
@@ -297,57 +465,63 @@ class AIReviewManifestService:
             )
 
             if resolved is None:
-                media_results.append({
-                    "media_id": row.media_id,
-                    "filename": row.filename,
-                    "predicted_class": None,
-                    "predicted_object": None,
-                    "predicted_angle": None,
-                    "confidence": None,
-                    "blur_score": None,
-                    "blur_warning": False,
-                    "duplicate_warning": False,
-                    "target_mismatch_warning": False,
-                    "error": "Image not found",
-                    "ai_reasons": ["Processing error"],
-                })
+                media_results.append(self._error_item(row, "Image not found"))
                 continue
 
             try:
-                pred = self.classifier.predict(resolved)
-                blur = self.blur_detector.detect(resolved)
-
-                object_counter[pred["object"]] += 1
-                captured_by_object[pred["object"]].add(pred["angle"])
-
-                media_results.append({
-                    "media_id": row.media_id,
-                    "filename": row.filename,
-                    "predicted_class": pred["class_name"],
-                    "predicted_object": pred["object"],
-                    "predicted_angle": pred["angle"],
-                    "confidence": round(float(pred["confidence"]), 6),
-                    "blur_score": blur["blur_score"],
-                    "blur_warning": blur["blur_warning"],
-                    "duplicate_warning": False,
-                    "target_mismatch_warning": False,
-                    "error": None
-                })
+                source = self._source_fingerprint(resolved)
 
+                # Unchanged since the previous manifest: reuse its per-image result as is
+                prev = previous.get(row.media_id)
+                if prev is not None and prev.get("source") == source:
+                    media_results.append(self._result_item(row, self._ai_from_item(prev), source))
+                    continue
+
+                # Inference only runs for images not seen with this model + threshold
+                digest = self.result_cache.file_digest(resolved)
+                ai = self.result_cache.get(digest)
             except Exception as e:
-                media_results.append({
-                    "media_id": row.media_id,
-                    "filename": row.filename,
-                    "predicted_class": None,
-                    "predicted_object": None,
-                    "predicted_angle": None,
-                    "confidence": None,
-                    "blur_score": None,
-                    "blur_warning": False,
-                    "duplicate_warning": False,
-                    "target_mismatch_warning": False,
-                    "error": str(e)
-                })
+                media_results.append(self._error_item(row, str(e)))
+                continue
+
+            if ai is None:
+                pending.append((len(media_results), row, source, resolved, digest))
+                media_results.append(None)
+            else:
+                media_results.append(self._result_item(row, ai, source))
+
+        if on_progress is not None and pending:
+            on_progress(self._assemble(session_row, media_results, total_media, complete=False))
+
+        for i in range(0, len(pending), self.batch_size):
+            chunk = pending[i:i + self.batch_size]
+            inferred = self._infer_batch([resolved for _, _, _, resolved, _ in chunk])
+
+            for (idx, row, source, _, digest), ai in zip(chunk, inferred):
+                if isinstance(ai, Exception):
+                    media_results[idx] = self._error_item(row, str(ai))
+                    continue
+                self.result_cache.put(digest, ai)
+                media_results[idx] = self._result_item(row, ai, source)
+
+            if on_progress is not None and i + self.batch_size < len(pending):
+                on_progress(self._assemble(session_row, media_results, total_media, complete=False))
+
+        return self._assemble(session_row, media_results, total_media, complete=True)
+
+    def _assemble(self, session_row, media_results: list[dict | None], total_media: int, *, complete: bool) -> dict:
+        """
+        Manifest JSON from the per-image results produced so far (None = not
+        analysed yet). Session-level flags are recomputed from scratch each time.
+        """
+        media_results = [item for item in media_results if item is not None]
+
+        captured_by_object = defaultdict(set)
+        object_counter = Counter()
+        for item in media_results:
+            if item["error"] is None:
+                object_counter[item["predicted_object"]] += 1
+                captured_by_object[item["predicted_object"]].add(item["predicted_angle"])
 
         self._compute_duplicate_flags(media_results)
 
@@ -395,19 +569,26 @@ class AIReviewManifestService:
                 "name": self.model_name,
                 "version": self.model_version,
                 "path": str(self.model_path),
+                "cache_key": self.result_cache.model_key,
             },
             "blur_detection": {
                 "method": "variance_of_laplacian",
                 "threshold": self.blur_threshold,
+                "resolution": BLUR_SIDE,
             },
             "generated_at": self._now_iso(),
+            "status": "complete" if complete else "running",
+            "progress": {
+                "analyzed": len(media_results),
+                "total": total_media,
+            },
             "required_angles": sorted(REQUIRED_ANGLES),
             "session_summary": {
                 "target_object": detected_object,
                 "detected_object": detected_object,
                 "captured_angles": captured_angles,
                 "missing_angles": missing_angles,
-                "total_media": len(rows),
+                "total_media": total_media,
             },
             "media_results": media_results,
         }
@@ -416,15 +597,59 @@ class AIReviewManifestService:
     # Persistence
     # -------------------------------------------------------------------------
 
+    @staticmethod
+    def read_manifest(import_session_id: int) -> dict | None:
+        """Last manifest written for the session (possibly partial), without loading any model."""
+        path = AIReviewManifestService._manifest_path(import_session_id)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _load_previous_results(self, import_session_id: int) -> dict[int, dict]:
+        """
+        Successful per-image results from the last manifest (complete or partial),
+        by media_id. Empty when there is none, or it was built with a different
+        model or blur threshold (everything is then looked up / inferred again).
+        """
+        previous = self.read_manifest(import_session_id)
+        if previous is None:
+            return {}
+
+        if (
+            previous.get("model", {}).get("cache_key") != self.result_cache.model_key
+            or previous.get("blur_detection", {}).get("threshold") != self.blur_threshold
+        ):
+            return {}
+
+        return {
+            item["media_id"]: item
+            for item in previous.get("media_results", [])
+            if item.get("error") is None and item.get("source")
+        }
+
     def write_manifest(self, import_session_id: int, manifest: dict) -> Path:
-        """Write manifest JSON to disk."""
+        """Write manifest JSON to disk atomically (readers never see a partial file)."""
         AI_REVIEW_DIR.mkdir(parents=True, exist_ok=True)
         path = self._manifest_path(import_session_id)
-        path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
         return path
 
     def build_and_write_manifest(self, db: Session, import_session_id: int):
-        """Convenience wrapper."""
-        manifest = self.build_manifest(db, import_session_id)
-        path = self.write_manifest(import_session_id, manifest)
+        """
+        Convenience wrapper. Raises SessionBusyError if the manifest for this
+        session is already being built elsewhere.
+        """
+        with session_lock("manifest", import_session_id):
+            manifest = self.build_manifest(
+                db,
+                import_session_id,
+                on_progress=lambda partial: self.write_manifest(import_session_id, partial),
+            )
+            path = self.write_manifest(import_session_id, manifest)
         return manifest, path
\ No newline at end of file
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from src.db.models import DecisionRollupHourly, RollupState
+from src.db.rollups import ROLLUP_NAME
+
+
+@dataclass(frozen=True, slots=True)
+class OperatorHourRow:
+    bucket_start: object
+    operator_id: str
+    accepted_count: int
+    rejected_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class OperatorSummaryRow:
+    operator_id: str
+    decision_count: int
+    accepted_count: int
+    rejected_count: int
+    avg_ingest_to_decision_seconds: float
+    max_ingest_to_decision_seconds: float
+
+
+@dataclass(frozen=True, slots=True)
+class RejectReasonRow:
+    reason: str
+    decision_count: int
+
+
+class AnalyticsService:
+    """
+    Read-only queries over ipds.decision_rollup_hourly. Nothing here touches
+    decisions/media, so cost depends on the number of hours, not decisions.
+    """
+
+    @staticmethod
+    def _window(since, until):
+        R = DecisionRollupHourly
+        where = [R.bucket_start >= since]
+        if until is not None:
+            where.append(R.bucket_start < until)
+        return where
+
+    @staticmethod
+    def refreshed_through(db: Session):
+        return db.scalar(select(RollupState.refreshed_through).where(RollupState.name == ROLLUP_NAME))
+
+    @staticmethod
+    def operator_hours(db: Session, *, since, until=None) -> list[OperatorHourRow]:
+        """Decisions per operator per hour, newest hour first."""
+        R = DecisionRollupHourly
+        stmt = (
+            select(
+                R.bucket_start,
+                R.operator_id,
+                func.sum(case((R.status == "accepted", R.decision_count), else_=0)),
+                func.sum(case((R.status == "rejected", R.decision_count), else_=0)),
+            )
+            .where(*AnalyticsService._window(since, until))
+            .group_by(R.bucket_start, R.operator_id)
+            .order_by(R.bucket_start.desc(), R.operator_id)
+        )
+        return [
+            OperatorHourRow(bucket, op, int(acc), int(rej))
+            for bucket, op, acc, rej in db.execute(stmt).all()
+        ]
+
+    @staticmethod
+    def operator_summary(db: Session, *, since, until=None) -> list[OperatorSummaryRow]:
+        """Per-operator totals and ingest-to-decision time over the window."""
+        R = DecisionRollupHourly
+        total = func.sum(R.decision_count)
+        stmt = (
+            select(
+                R.operator_id,
+                total,
+                func.sum(case((R.status == "accepted", R.decision_count), else_=0)),
+                func.sum(case((R.status == "rejected", R.decision_count), else_=0)),
+                func.sum(R.ingest_to_decision_seconds_sum) / func.nullif(total, 0),
+                func.max(R.ingest_to_decision_seconds_max),
+            )
+            .where(*AnalyticsService._window(since, until))
+            .group_by(R.operator_id)
+            .order_by(total.desc())
+        )
+        return [
+            OperatorSummaryRow(op, int(n), int(acc), int(rej), float(avg or 0), float(mx or 0))
+            for op, n, acc, rej, avg, mx in db.execute(stmt).all()
+        ]
+
+    @staticmethod
+    def reject_reasons(db: Session, *, since, until=None) -> list[RejectReasonRow]:
+        """Rejected decisions by normalised reason ('' = no reason given)."""
+        R = DecisionRollupHourly
+        total = func.sum(R.decision_count)
+        stmt = (
+            select(R.reason, total)
+            .where(R.status == "rejected", *AnalyticsService._window(since, until))
+            .group_by(R.reason)
+            .order_by(total.desc())
+        )
+        return [RejectReasonRow(reason, int(n)) for reason, n in db.execute(stmt).all()]
@@ -1,53 +1,212 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.db.models import Media, ImportSession
-from src.db.repo_decisions import upsert_decision
+from src.db.models import Decisions, ImportSession, Media
+from src.db.ref_cache import get_session_header
+from src.db.repo_decisions import upsert_decision, bulk_upsert_decisions
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Media files are only served from these trees
+ALLOWED_MEDIA_ROOTS = [
+    Path("data/incoming").resolve(),
+    Path("data/archive").resolve(),
+]
+
+
+def _resolve_media_path(raw: str) -> Path | None:
+    p = Path(raw)
+
+    if not p.is_absolute():
+        p = Path.cwd() / p
+
+    try:
+        return p.resolve(strict=False)
+    except Exception:
+        return None
+
+
+def _is_under_allowed_root(p: Path) -> bool:
+    try:
+        p = p.resolve(strict=False)
+    except Exception:
+        return False
+
+    for root in ALLOWED_MEDIA_ROOTS:
+        root = root.resolve()
+        try:
+            p.relative_to(root)
+            return True
+        except ValueError:
+            continue
+    return False
+
+
+def _build_archive_candidates(*, uut_serial: str, import_session_id: int, filename: str) -> list[Path]:
+    archive_base = Path("data/archive") / f"{uut_serial}_{import_session_id}"
+    return [
+        archive_base / "accepted" / filename,
+        archive_base / "rejected" / filename,
+        archive_base / filename,  # fallback in case archive was stored flat
+    ]
+
+
+def _pick_media_path(row) -> Path | None:
+    """
+    Resolve media path in this order:
+    1. current Media.local_path if file still exists
+    2. archived accepted path
+    3. archived rejected path
+    4. flat archive fallback
+    """
+    local_path, filename, uut_serial, import_session_id, decision_status = row
+
+    if local_path:
+        current_path = _resolve_media_path(local_path)
+        if current_path and _is_under_allowed_root(current_path) and current_path.exists() and current_path.is_file():
+            return current_path
+
+    if not filename:
+        return None  # archived copies are found by file name
+
+    candidates = _build_archive_candidates(
+        uut_serial=uut_serial,
+        import_session_id=import_session_id,
+        filename=filename,
+    )
+
+    if decision_status == "accepted":
+        ordered = [
+            candidates[0],  # accepted
+            candidates[1],  # rejected
+            candidates[2],  # flat
+        ]
+    elif decision_status == "rejected":
+        ordered = [
+            candidates[1],  # rejected
+            candidates[0],  # accepted
+            candidates[2],  # flat
+        ]
+    else:
+        ordered = candidates
+
+    for candidate in ordered:
+        resolved = _resolve_media_path(str(candidate))
+        if resolved and _is_under_allowed_root(resolved) and resolved.exists() and resolved.is_file():
+            return resolved
+
+    return None
 
 
 class DecisionServiceError(Exception):
     pass
 
 
-@dataclass(frozen=True)
+class DecisionConflictError(DecisionServiceError):
+    """Raised when another reviewer changed the decision since it was loaded."""
+    pass
+
+
+@dataclass(frozen=True, slots=True)
 class MediaDecisionView:
+    # Field order matches DecisionService._list_media_stmt columns
     media_id: int
     local_path: str
     captured_at: object | None
     decision_status: str | None
     decision_reason: str | None
     decision_notes: str | None
+    decision_version: int | None
 
 
 class DecisionService:
     VALID = {"accepted", "rejected"}
 
     @staticmethod
-    def list_media_for_session(db: Session, import_session_id: int) -> list[MediaDecisionView]:
-        # Better ordering than media_id: show in capture-time order when available
-        rows = db.scalars(
-            select(Media)
+    def _list_media_stmt(import_session_id: int):
+        # Column projection with the decision joined in, so no lazy loads are needed
+        return (
+            select(
+                Media.media_id,
+                Media.local_path,
+                Media.captured_at,
+                Decisions.status,
+                Decisions.reason,
+                Decisions.notes,
+                Decisions.version,
+            )
+            .outerjoin(
+                Decisions,
+                (Decisions.media_id == Media.media_id)
+                & (Decisions.import_session_id == Media.import_session_id),
+            )
             .where(Media.import_session_id == import_session_id)
             .order_by(Media.captured_at.asc().nulls_last(), Media.media_id.asc())
-        ).all()
-
-        out: list[MediaDecisionView] = []
-        for m in rows:
-            d = m.decision
-            out.append(
-                MediaDecisionView(
-                    media_id=m.media_id,
-                    local_path=m.local_path,
-                    captured_at=m.captured_at,
-                    decision_status=(d.status if d else None),
-                    decision_reason=(d.reason if d else None),
-                    decision_notes=(d.notes if d else None),
-                )
+        )
+
+    @staticmethod
+    async def list_media_for_session_async(db: "AsyncSession", import_session_id: int) -> list[MediaDecisionView]:
+        """Async variant of list_media_for_session for async-capable routes."""
+        result = await db.execute(DecisionService._list_media_stmt(import_session_id))
+        return [MediaDecisionView(*row) for row in result.all()]
+
+    @staticmethod
+    def list_media_for_session(db: Session, import_session_id: int) -> list[MediaDecisionView]:
+        # Better ordering than media_id: show in capture-time order when available
+        rows = db.execute(DecisionService._list_media_stmt(import_session_id)).all()
+        return [MediaDecisionView(*row) for row in rows]
+
+    @staticmethod
+    def iter_media_for_session(
+        db: Session,
+        import_session_id: int,
+        *,
+        chunk_size: int = 500,
+    ) -> Iterator[MediaDecisionView]:
+        """Streaming variant: rows are fetched chunk_size at a time (server-side cursor)."""
+        result = db.execute(
+            DecisionService._list_media_stmt(import_session_id).execution_options(yield_per=chunk_size)
+        )
+        for row in result:
+            yield MediaDecisionView(*row)
+
+    @staticmethod
+    def _media_path_stmt(media_id: int):
+        return (
+            select(
+                Media.local_path,
+                Media.filename,
+                ImportSession.uut_serial,
+                ImportSession.import_session_id,
+                Decisions.status,
+            )
+            .join(ImportSession, ImportSession.import_session_id == Media.import_session_id)
+            .outerjoin(
+                Decisions,
+                (Decisions.media_id == Media.media_id)
+                & (Decisions.import_session_id == Media.import_session_id),
             )
-        return out
+            .where(Media.media_id == media_id)
+        )
+
+    @staticmethod
+    def find_media_path(db: Session, media_id: int) -> Path | None:
+        """File to serve for a media row: its local path, else its archived copy. None if missing."""
+        row = db.execute(DecisionService._media_path_stmt(media_id)).first()
+        return _pick_media_path(row) if row else None
+
+    @staticmethod
+    async def find_media_path_async(db: "AsyncSession", media_id: int) -> Path | None:
+        """Async variant of find_media_path for async-capable routes."""
+        row = (await db.execute(DecisionService._media_path_stmt(media_id))).first()
+        return _pick_media_path(row) if row else None
 
     @staticmethod
     def set_decision_for_media(
@@ -58,20 +217,20 @@ class DecisionService:
         status: str,
         reason: str | None = None,
         notes: str | None = None,
+        expected_version: int | None = None,
     ) -> None:
         """
         Single-item decision.
         Enforces: media_id must belong to import_session_id.
         Operator is derived from ImportSession.operator_id (not stored in decision row).
+        expected_version: version the operator saw (0 = undecided, None = skip check).
         """
         status = (status or "").strip().lower()
         if status not in DecisionService.VALID:
             raise DecisionServiceError("Invalid decision status. Must be 'accepted' or 'rejected'.")
 
-        # Ensure session exists
-        sess = db.scalar(
-            select(ImportSession).where(ImportSession.import_session_id == import_session_id)
-        )
+        # Ensure session exists (cached: the header does not change during review)
+        sess = get_session_header(db, import_session_id)
         if not sess:
             raise DecisionServiceError(f"ImportSession not found: {import_session_id}")
 
@@ -86,13 +245,21 @@ class DecisionService:
         if not ok:
             raise DecisionServiceError(f"Media {mid} is not in ImportSession {import_session_id}")
 
-        upsert_decision(
+        row = upsert_decision(
             db,
             media_id=mid,
             status=status,
             reason=reason,
             notes=notes,
+            expected_version=expected_version,
+            import_session_id=import_session_id,
         )
+        if row is None:
+            current = db.scalar(select(Decisions).where(Decisions.media_id == mid))
+            now = current.status if current else "undecided"
+            raise DecisionConflictError(
+                f"Media {mid} was changed by another reviewer (now: {now}). Review it again before deciding."
+            )
     
     @staticmethod
     def bulk_set_decisions_for_session(
@@ -118,9 +285,7 @@ class DecisionService:
         if not media_ids:
             return 0
 
-        sess = db.scalar(
-            select(ImportSession).where(ImportSession.import_session_id == import_session_id)
-        )
+        sess = get_session_header(db, import_session_id)
         if not sess:
             raise DecisionServiceError(f"ImportSession not found: {import_session_id}")
 
@@ -140,14 +305,14 @@ class DecisionService:
                 f"Some media IDs are not in this session: {missing_or_wrong_session}"
             )
 
-        for mid in media_ids:
-            upsert_decision(
-                db,
-                media_id=mid,
-                status=status,
-                reason=reason,
-                notes=notes,
-            )
+        bulk_upsert_decisions(
+            db,
+            media_ids=media_ids,
+            status=status,
+            reason=reason,
+            notes=notes,
+            import_session_id=import_session_id,
+        )
 
         return len(media_ids)
     
\ No newline at end of file
@@ -6,13 +6,14 @@ import zipfile
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from src.db.models import ImportSession, Jobs, Media, Decisions, Exports, LocalArchives
+from src.db.models import ImportSession, Jobs, Media, Decisions, Exports, ExportItems, LocalArchives
+from src.db.session_locks import session_lock
 from src.utils.hashing import sha256_file, sha256_bytes
 from src.utils.embed import embed_ipds_metadata
 from src.utils.watermark import burn_watermark
@@ -39,33 +40,66 @@ def build_export_photo_name(*, uut_serial: str, operator_id: str, export_ts: str
     safe_op = _sanitize_token(operator_id)
     return f"{safe_uut}_{safe_op}_{export_ts}_{seq:03d}{ext}"
 
-# Query to retrieve accepted image
-def _get_accepted_media(db: Session, import_session_id: int) -> list[tuple[Media, Decisions]]:
-    stmt = (
-        select(Media, Decisions)
-        .join(Decisions, Decisions.media_id == Media.media_id)
-        .where(Media.import_session_id == import_session_id)
-        .where(Decisions.status == "accepted")
-        .order_by(
-            Media.captured_at.asc().nulls_last(),
-            Media.media_id.asc(),
+# Rows fetched per round trip when streaming session media
+_STREAM_CHUNK_SIZE = 500
+
+@dataclass(frozen=True, slots=True)
+class _AcceptedMediaRow:
+    media_id: int
+    import_session_id: int
+    filename: str | None
+    local_path: str
+    vendor_id: str
+    captured_at: datetime | None
+    status: str
+    reason: str | None
+    decided_at: datetime | None
+    notes: str | None
+
+def _decided_media_stmt(import_session_id: int, *columns):
+    return (
+        select(*columns)
+        .join(
+            Decisions,
+            (Decisions.media_id == Media.media_id)
+            & (Decisions.import_session_id == Media.import_session_id),
         )
-    )
-    return list(db.execute(stmt).all())
-
-def _get_all_media(db: Session, import_session_id: int) -> list[tuple[Media, Decisions]]:
-    stmt = (
-        select(Media, Decisions)
-        .join(Decisions, Decisions.media_id == Media.media_id)
         .where(Media.import_session_id == import_session_id)
         .order_by(
             Media.captured_at.asc().nulls_last(),
             Media.media_id.asc(),
         )
     )
-    return list(db.execute(stmt).all())
 
-def resolve_source_file(media) -> Path:
+def _has_accepted_media(db: Session, import_session_id: int) -> bool:
+    stmt = _decided_media_stmt(import_session_id, Media.media_id).where(Decisions.status == "accepted")
+    return db.execute(stmt.limit(1)).first() is not None
+
+# Query to retrieve accepted image
+def _get_accepted_media(db: Session, import_session_id: int) -> Iterator[_AcceptedMediaRow]:
+    """Streamed from a server-side cursor; only the columns the export needs."""
+    stmt = _decided_media_stmt(
+        import_session_id,
+        Media.media_id,
+        Media.import_session_id,
+        Media.filename,
+        Media.local_path,
+        Media.vendor_id,
+        Media.captured_at,
+        Decisions.status,
+        Decisions.reason,
+        Decisions.decided_at,
+        Decisions.notes,
+    ).where(Decisions.status == "accepted")
+    result = db.execute(stmt.execution_options(yield_per=_STREAM_CHUNK_SIZE))
+    return (_AcceptedMediaRow(*row) for row in result)
+
+def _get_all_media_paths(db: Session, import_session_id: int) -> Iterator[str]:
+    """local_path of every decided media row, streamed."""
+    stmt = _decided_media_stmt(import_session_id, Media.local_path)
+    return db.execute(stmt.execution_options(yield_per=_STREAM_CHUNK_SIZE)).scalars()
+
+def resolve_source_file(media, *, uut_serial: str | None = None) -> Path:
     candidates = []
 
     if getattr(media, "local_path", None):
@@ -74,8 +108,7 @@ def resolve_source_file(media) -> Path:
     filename = Path(media.filename).name if getattr(media, "filename", None) else None
     session_id = getattr(media, "import_session_id", None)
 
-    uut_serial = None
-    if getattr(media, "import_session", None) and getattr(media.import_session, "uut_serial", None):
+    if uut_serial is None and getattr(media, "import_session", None) and getattr(media.import_session, "uut_serial", None):
         uut_serial = media.import_session.uut_serial
 
     if filename and session_id is not None and uut_serial:
@@ -144,15 +177,26 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
       - Photos renamed per proposal and stored in ZIP under photos/
       - manifest.json stored at ZIP root, includes per-file sha256 + size
       - DB records: exports + local_archives (mandatory)
+
+    Raises SessionBusyError if this session is already being exported:
+    concurrent runs would share the staging dir and pick the same _vN name.
     """
+    with session_lock("export", import_session_id):
+        return _export_session_to_zip(
+            db=db,
+            import_session_id=import_session_id,
+            export_root=export_root,
+            archive_root=archive_root,
+        )
+
+def _export_session_to_zip(*, db: Session, import_session_id: int, export_root: Path, archive_root: Path,) -> ZipExportResult:
     sess = db.get(ImportSession, import_session_id)
     if not sess:
         raise RuntimeError(f"ImportSession not found: {import_session_id}")
     job = db.get(Jobs, sess.job_id)
     if not job:
         raise RuntimeError(f"Job not found for session job_id={sess.job_id}")
-    accepted = _get_accepted_media(db, import_session_id)
-    if not accepted:
+    if not _has_accepted_media(db, import_session_id):
         raise RuntimeError("No accepted media found. Nothing to export.")
     
     uut_serial = sess.uut_serial
@@ -174,10 +218,11 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
     export_ts = _ts_for_filename()  # one timestamp for the whole export batch
 
     files_manifest: list[dict[str, Any]] = []
+    export_items: list[dict[str, Any]] = []
 
     seq = 1
-    for media, decision in accepted:
-        src = resolve_source_file(media)
+    for row in _get_accepted_media(db, import_session_id):
+        src = resolve_source_file(row, uut_serial=uut_serial)
         if not src.exists():
             shutil.rmtree(staging_dir, ignore_errors=True)
             raise RuntimeError(f"Missing source file on disk: {src}")
@@ -187,7 +232,7 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
             operator_id=operator_id,
             export_ts=export_ts,
             seq=seq,
-            original_name=(media.filename or src.name)
+            original_name=(row.filename or src.name)
         )
 
         dst = staging_dir / export_name
@@ -197,7 +242,7 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
             str(dst),
             uut_serial=uut_serial,
             import_session_id=import_session_id,
-            captured_at=media.captured_at
+            captured_at=row.captured_at
         )
 
         dt = datetime.now(timezone.utc)
@@ -220,19 +265,29 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
             {
                 "seq": seq,
                 "export_name": export_name,
-                "source_vendor_id": media.vendor_id,
+                "source_vendor_id": row.vendor_id,
                 "source_local_path": str(src),
                 "size_bytes": size,
                 "sha256": sha,
-                "captured_at": media.captured_at.isoformat() if media.captured_at else None,
+                "captured_at": row.captured_at.isoformat() if row.captured_at else None,
                 "decision": {
-                    "status": decision.status,
-                    "reason": decision.reason,
-                    "decided_at": decision.decided_at.isoformat() if decision.decided_at else None,
-                    "notes": decision.notes
+                    "status": row.status,
+                    "reason": row.reason,
+                    "decided_at": row.decided_at.isoformat() if row.decided_at else None,
+                    "notes": row.notes
                 },
             }
         )
+        export_items.append(
+            {
+                "seq": seq,
+                "import_session_id": import_session_id,
+                "media_id": row.media_id,
+                "export_name": export_name,
+                "sha256": sha,
+                "size_bytes": size,
+            }
+        )
         seq += 1
 
     # Building of manifest.json 
@@ -281,14 +336,19 @@ def export_session_to_zip(*, db: Session, import_session_id: int, export_root: P
     db.flush()
     db.refresh(export_row)
 
+    # Lineage rows, committed together with the export row
+    db.execute(
+        insert(ExportItems),
+        [item | {"export_id": export_row.export_id} for item in export_items],
+    )
+
     archive_dir = archive_root / f"{uut_serial}_{import_session_id}"
     archive_dir.mkdir(parents=True, exist_ok=True)
 
-    all_media = _get_all_media(db, import_session_id)
     archived_count = 0
 
-    for media, _decision in all_media:
-        src = Path(media.local_path)
+    for local_path in _get_all_media_paths(db, import_session_id):
+        src = Path(local_path)
         if not src.exists():
             continue
 
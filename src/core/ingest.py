@@ -33,8 +33,9 @@ def save_bytes_atomic(dest: Path, data: bytes, expected_size: int) -> tuple[Path
     return dest, sha
 
 def already_imported(db: Session, adapter_name: str, vendor_id: str) -> bool:
-    q = select(Media.media_id).where(Media.adapter == adapter_name, Media.vendor_id == vendor_id)
-    return db.execute(q).scalar_one_or_none() is not None
+    # LIMIT 1: partitioned databases may hold legacy cross-session duplicates
+    q = select(Media.media_id).where(Media.adapter == adapter_name, Media.vendor_id == vendor_id).limit(1)
+    return db.execute(q).first() is not None
 
 @dataclass
 class IngestSummary:
@@ -2,12 +2,23 @@ from pathlib import Path
 
 from src.adapter.olympus import OlympusTG7Adapter
 from src.db.session import SessionLocal
+from src.db.session_locks import session_lock
+from src.db.partitions import ensure_future_partitions
 from src.db.models import ImportSession
 from src.db.repo_media import insert_media_idempotent
 from src.core.ingest import save_bytes_atomic, already_imported
 
 
 def run_ingestion_for_session(import_session_id: int) -> dict:
+    """
+    Pull new media from the camera into a session.
+    Raises SessionBusyError if another worker is already ingesting this session.
+    """
+    with session_lock("ingest", import_session_id):
+        return _run_ingestion(import_session_id)
+
+
+def _run_ingestion(import_session_id: int) -> dict:
     imported = 0
     skipped = 0
     failed = 0
@@ -17,6 +28,10 @@ def run_ingestion_for_session(import_session_id: int) -> dict:
         if not session:
             raise RuntimeError("ImportSession not found")
 
+        # New sessions may have moved past the last media/decisions partition
+        ensure_future_partitions(db.connection())
+        db.commit()
+
         incoming_dir = Path("data/incoming") / f"session_{import_session_id}"
         incoming_dir.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from src.db.models import Decisions, Exports, ImportSession, Jobs, Media
+
+
+class SearchServiceError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSearchRow:
+    import_session_id: int
+    job_id: str
+    uut_serial: str
+    operator_id: str
+    status: str
+    session_purpose: str
+    started_at: object
+    total_count: int
+    accepted_count: int
+    rejected_count: int
+    has_export: bool
+
+
+@dataclass(frozen=True, slots=True)
+class JobSearchRow:
+    job_id: str
+    status: str
+    created_at: object
+    session_count: int
+    running_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPage:
+    items: list
+    page: int
+    per_page: int
+    has_next: bool
+
+
+def _like_pattern(q: str, mode: str) -> str:
+    # Escape LIKE wildcards so "A_1%" searches literally
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if mode == "prefix" else f"%{escaped}%"
+
+
+class SearchService:
+    MODES = {"prefix", "contains"}
+    MAX_PER_PAGE = 200
+
+    @staticmethod
+    def _check(q: str, mode: str, page: int, per_page: int) -> tuple[str, int, int]:
+        q = (q or "").strip()
+        if not q:
+            raise SearchServiceError("Search text is required.")
+        if mode not in SearchService.MODES:
+            raise SearchServiceError("Invalid search mode. Must be 'prefix' or 'contains'.")
+        page = max(int(page), 1)
+        per_page = min(max(int(per_page), 1), SearchService.MAX_PER_PAGE)
+        return q, page, per_page
+
+    @staticmethod
+    def search_sessions(
+        db: Session,
+        q: str,
+        *,
+        mode: str = "contains",
+        page: int = 1,
+        per_page: int = 50,
+    ) -> SearchPage:
+        """
+        Sessions whose uut_serial matches q (case-insensitive), newest first.
+        One statement: the page of sessions is picked first (trigram index),
+        then media/decision counts and export presence are aggregated for that page only.
+        """
+        q, page, per_page = SearchService._check(q, mode, page, per_page)
+
+        # One extra row tells us whether a next page exists without a COUNT(*)
+        page_cte = (
+            select(
+                ImportSession.import_session_id,
+                ImportSession.job_id,
+                ImportSession.uut_serial,
+                ImportSession.operator_id,
+                ImportSession.status,
+                ImportSession.session_purpose,
+                ImportSession.started_at,
+            )
+            .where(ImportSession.uut_serial.ilike(_like_pattern(q, mode), escape="\\"))
+            .order_by(ImportSession.import_session_id.desc())
+            .limit(per_page + 1)
+            .offset((page - 1) * per_page)
+            .cte("page")
+        )
+
+        has_export = (
+            select(Exports.export_id)
+            .where(Exports.import_session_id == page_cte.c.import_session_id)
+            .exists()
+        )
+
+        stmt = (
+            select(
+                *page_cte.c,
+                func.count(Media.media_id),
+                func.coalesce(func.sum(case((Decisions.status == "accepted", 1), else_=0)), 0),
+                func.coalesce(func.sum(case((Decisions.status == "rejected", 1), else_=0)), 0),
+                has_export,
+            )
+            .outerjoin(Media, Media.import_session_id == page_cte.c.import_session_id)
+            .outerjoin(
+                Decisions,
+                (Decisions.media_id == Media.media_id)
+                & (Decisions.import_session_id == Media.import_session_id),
+            )
+            .group_by(*page_cte.c)
+            .order_by(page_cte.c.import_session_id.desc())
+        )
+
+        rows = [SessionSearchRow(*row) for row in db.execute(stmt).all()]
+        return SearchPage(items=rows[:per_page], page=page, per_page=per_page, has_next=len(rows) > per_page)
+
+    @staticmethod
+    def search_jobs(
+        db: Session,
+        q: str,
+        *,
+        mode: str = "contains",
+        page: int = 1,
+        per_page: int = 50,
+    ) -> SearchPage:
+        """Jobs whose job_id matches q (case-insensitive), with session counts."""
+        q, page, per_page = SearchService._check(q, mode, page, per_page)
+
+        page_cte = (
+            select(Jobs.job_id, Jobs.status, Jobs.created_at)
+            .where(Jobs.job_id.ilike(_like_pattern(q, mode), escape="\\"))
+            .order_by(Jobs.job_id.desc())
+            .limit(per_page + 1)
+            .offset((page - 1) * per_page)
+            .cte("page")
+        )
+
+        stmt = (
+            select(
+                *page_cte.c,
+                func.count(ImportSession.import_session_id),
+                func.coalesce(func.sum(case((ImportSession.status == "running", 1), else_=0)), 0),
+            )
+            .outerjoin(ImportSession, ImportSession.job_id == page_cte.c.job_id)
+            .group_by(*page_cte.c)
+            .order_by(page_cte.c.job_id.desc())
+        )
+
+        rows = [JobSearchRow(*row) for row in db.execute(stmt).all()]
+        return SearchPage(items=rows[:per_page], page=page, per_page=per_page, has_next=len(rows) > per_page)
@@ -0,0 +1,435 @@
+"""
+Session bundles: move import sessions (rows + files) between stations/databases.
+
+A bundle is one uncompressed ZIP:
+    bundle.json         format, schema revision, columns, file index
+    tables/<table>.bin  rows as Postgres binary COPY
+    files/<n>_<name>    media files, export zips/manifests, archive folders
+
+Export streams each table with COPY (SELECT ...) TO STDOUT (FORMAT binary).
+Import COPYs the rows into temp tables, gives every session/media/decision/
+export/archive a fresh ID from the target sequences, rewrites stored paths to
+this station's data folders, places the files with a thread pool and inserts
+everything in one transaction. Jobs and operators keep their natural keys and
+are only added when missing.
+
+Usage:
+    python -m src.core.session_bundle export 12 13 14 -o moved.ipdsbundle
+    python -m src.core.session_bundle import moved.ipdsbundle [--workers 8]
+
+Postgres only (COPY); both databases must be at the same Alembic revision.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.config import Config
+from src.db.base import DB_SCHEMA
+from src.db.models import Decisions, ExportItems, Exports, ImportSession, Jobs, LocalArchives, Media, Operators
+from src.db.partitions import ensure_future_partitions
+
+BUNDLE_FORMAT = "ipds_session_bundle_v1"
+
+# Load order; each entry: model, surrogate key (None = natural key), FK column -> remapped table
+_TABLES = (
+    (Jobs, None, {}),
+    (Operators, None, {}),
+    (ImportSession, "import_session_id", {}),
+    (Media, "media_id", {"import_session_id": "import_session"}),
+    (Decisions, "decision_id", {"import_session_id": "import_session", "media_id": "media"}),
+    (Exports, "export_id", {"import_session_id": "import_session"}),
+    (LocalArchives, "archive_id", {"export_id": "exports"}),
+    (ExportItems, None, {"export_id": "exports", "import_session_id": "import_session", "media_id": "media"}),
+)
+
+# Columns holding file system paths, rewritten on import
+_PATH_COLUMNS = {
+    "media": ("local_path",),
+    "exports": ("export_path", "manifest_path"),
+    "local_archives": ("archive_path",),
+}
+
+DEFAULT_WORKERS = 8
+
+
+class SessionBundleError(Exception):
+    pass
+
+
+@dataclass
+class BundleResult:
+    session_ids: dict[int, int]  # source id -> id in the target database (same on export)
+    row_counts: dict[str, int]
+    file_count: int
+
+
+def _columns(model) -> list[str]:
+    return [c.name for c in model.__table__.columns]
+
+
+def _id_list(ids) -> str:
+    return ",".join(str(int(i)) for i in ids)
+
+
+def _where(table: str, ids: str) -> str:
+    # Every bundled row hangs off the selected sessions
+    if table == "jobs":
+        return f"job_id IN (SELECT job_id FROM {DB_SCHEMA}.import_session WHERE import_session_id IN ({ids}))"
+    if table == "operators":
+        return f"operator_id IN (SELECT operator_id FROM {DB_SCHEMA}.import_session WHERE import_session_id IN ({ids}))"
+    if table == "local_archives":
+        return f"export_id IN (SELECT export_id FROM {DB_SCHEMA}.exports WHERE import_session_id IN ({ids}))"
+    return f"import_session_id IN ({ids})"
+
+
+def _schema_revision(conn: Connection) -> str | None:
+    exists = conn.execute(text("SELECT to_regclass(:t)"), {"t": f"{DB_SCHEMA}.alembic_version"}).scalar()
+    if not exists:
+        return None
+    return conn.execute(text(f"SELECT version_num FROM {DB_SCHEMA}.alembic_version")).scalar()
+
+
+def _driver_cursor(conn: Connection):
+    # psycopg cursor on the same connection/transaction as conn
+    return conn.connection.driver_connection.cursor()
+
+
+def _require_postgres(conn: Connection) -> None:
+    if conn.dialect.name != "postgresql":
+        raise SessionBundleError("Session bundles use Postgres COPY and need a Postgres DATABASE_URL.")
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def _files_for_rows(conn: Connection, ids: str) -> list[dict]:
+    """Files referenced by the bundled rows: (table, old_id, column, rel-path-inside-dir)."""
+    refs: list[tuple[str, int, str, Path]] = []
+    for media_id, local_path in conn.execute(text(
+        f"SELECT media_id, local_path FROM {DB_SCHEMA}.media WHERE import_session_id IN ({ids})"
+    )):
+        refs.append(("media", media_id, "local_path", Path(local_path)))
+    for export_id, export_path, manifest_path in conn.execute(text(
+        f"SELECT export_id, export_path, manifest_path FROM {DB_SCHEMA}.exports WHERE import_session_id IN ({ids})"
+    )):
+        refs.append(("exports", export_id, "export_path", Path(export_path)))
+        refs.append(("exports", export_id, "manifest_path", Path(manifest_path)))
+    for archive_id, archive_path in conn.execute(text(
+        f"SELECT archive_id, archive_path FROM {DB_SCHEMA}.local_archives WHERE {_where('local_archives', ids)}"
+    )):
+        refs.append(("local_archives", archive_id, "archive_path", Path(archive_path)))
+
+    files = []
+    for table, old_id, column, path in refs:
+        if path.is_file():
+            files.append({"table": table, "old_id": old_id, "column": column, "rel": "", "src": path})
+        elif path.is_dir():
+            for f in sorted(p for p in path.rglob("*") if p.is_file()):
+                files.append({
+                    "table": table, "old_id": old_id, "column": column,
+                    "rel": f.relative_to(path).as_posix(), "src": f,
+                })
+        # Missing files (e.g. incoming folders removed on completion) are skipped
+    return files
+
+
+def export_sessions(conn: Connection, import_session_ids: list[int], bundle_path: Path) -> BundleResult:
+    _require_postgres(conn)
+    if not import_session_ids:
+        raise SessionBundleError("No import sessions given.")
+
+    ids = _id_list(sorted(set(import_session_ids)))
+    found = conn.execute(text(
+        f"SELECT import_session_id FROM {DB_SCHEMA}.import_session WHERE import_session_id IN ({ids})"
+    )).scalars().all()
+    missing = sorted(set(map(int, import_session_ids)) - set(found))
+    if missing:
+        raise SessionBundleError(f"ImportSession not found: {missing}")
+
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = bundle_path.with_name(bundle_path.name + ".part")
+    cur = _driver_cursor(conn)
+
+    row_counts: dict[str, int] = {}
+    tables_meta = {}
+    files = _files_for_rows(conn, ids)
+
+    # Photos are already compressed: store, don't deflate
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as z:
+        for model, _pk, _fks in _TABLES:
+            table = model.__tablename__
+            cols = _columns(model)
+            col_list = ", ".join(cols)
+            where = _where(table, ids)
+
+            row_counts[table] = conn.execute(
+                text(f"SELECT count(*) FROM {DB_SCHEMA}.{table} WHERE {where}")
+            ).scalar_one()
+            tables_meta[table] = cols
+
+            with z.open(f"tables/{table}.bin", "w", force_zip64=True) as out:
+                with cur.copy(
+                    f"COPY (SELECT {col_list} FROM {DB_SCHEMA}.{table} WHERE {where}) TO STDOUT (FORMAT binary)"
+                ) as copy:
+                    for chunk in copy:
+                        out.write(chunk)
+
+        index = []
+        for n, f in enumerate(files):
+            arc = f"files/{n:07d}_{f['src'].name}"
+            z.write(f["src"], arcname=arc)
+            index.append({k: f[k] for k in ("table", "old_id", "column", "rel")} | {
+                "arc": arc,
+                "size_bytes": f["src"].stat().st_size,
+            })
+
+        meta = {
+            "format": BUNDLE_FORMAT,
+            "schema_revision": _schema_revision(conn),
+            "import_session_ids": found,
+            "tables": tables_meta,
+            "row_counts": row_counts,
+            "files": index,
+        }
+        z.writestr("bundle.json", json.dumps(meta, indent=2))
+
+    tmp_path.replace(bundle_path)
+    return BundleResult(session_ids={i: i for i in found}, row_counts=row_counts, file_count=len(files))
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _rename_export_file(name: str, old_session_id: int, new_session_id: int) -> str:
+    # <UUT>_<session>.zip / <UUT>_<session>_v2.zip (+ .manifest.json)
+    renamed, n = re.subn(
+        rf"_{old_session_id}(?=(_v\d+)?\.zip)", f"_{new_session_id}", name, count=1
+    )
+    return renamed if n else f"imported_{new_session_id}_{name}"
+
+
+def _new_paths(conn: Connection, session_map: dict[int, int]) -> list[tuple[str, int, str, str]]:
+    """(table, old_id, column, new_path) for every path column of the staged rows."""
+    incoming = Path(Config.INCOMING_DIR)
+    archive = Path(Config.ARCHIVE_DIR)
+    exports = Path(Config.EXPORT_DIR)
+
+    uut = dict(conn.execute(text("SELECT import_session_id, uut_serial FROM bundle_import_session")).all())
+    out = []
+
+    for media_id, sid, local_path in conn.execute(text(
+        "SELECT media_id, import_session_id, local_path FROM bundle_media"
+    )):
+        new_sid = session_map[sid]
+        out.append(("media", media_id, "local_path", str(incoming / f"session_{new_sid}" / Path(local_path).name)))
+
+    export_sessions_by_id = {}
+    for export_id, sid, export_path, manifest_path in conn.execute(text(
+        "SELECT export_id, import_session_id, export_path, manifest_path FROM bundle_exports"
+    )):
+        new_sid = session_map[sid]
+        export_sessions_by_id[export_id] = sid
+        out.append(("exports", export_id, "export_path",
+                    str(exports / _rename_export_file(Path(export_path).name, sid, new_sid))))
+        out.append(("exports", export_id, "manifest_path",
+                    str(exports / _rename_export_file(Path(manifest_path).name, sid, new_sid))))
+
+    for archive_id, export_id in conn.execute(text("SELECT archive_id, export_id FROM bundle_local_archives")):
+        sid = export_sessions_by_id[export_id]
+        out.append(("local_archives", archive_id, "archive_path",
+                    str(archive / f"{uut[sid]}_{session_map[sid]}")))
+    return out
+
+
+def _select_list(table: str, cols: list[str], pk: str | None, fks: dict[str, str]) -> str:
+    exprs = []
+    for col in cols:
+        if col == pk:
+            exprs.append(f"(SELECT new_id FROM bundle_map_{table} m WHERE m.old_id = t.{col})")
+        elif col in fks:
+            ref = fks[col]
+            exprs.append(f"(SELECT new_id FROM bundle_map_{ref} m WHERE m.old_id = t.{col})")
+        elif col in _PATH_COLUMNS.get(table, ()):
+            exprs.append(
+                f"(SELECT new_path FROM bundle_paths p WHERE p.table_name = '{table}' "
+                f"AND p.old_id = t.{pk} AND p.column_name = '{col}')"
+            )
+        elif table == "decisions" and col == "updated_at":
+            exprs.append("now()")  # picked up by the next rollup refresh
+        else:
+            exprs.append(f"t.{col}")
+    return ", ".join(exprs)
+
+
+def _place_files(bundle_path: Path, placements: list[tuple[str, Path, int]], workers: int) -> list[Path]:
+    """Extract (arcname, dest, size) in parallel; returns the written paths."""
+    local = threading.local()
+    written: list[Path] = []
+    lock = threading.Lock()
+
+    def place(item):
+        arc, dest, size = item
+        z = getattr(local, "zip", None)
+        if z is None:
+            z = local.zip = zipfile.ZipFile(bundle_path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".part")
+        with z.open(arc) as src, open(tmp, "wb") as out:
+            shutil.copyfileobj(src, out, length=1024 * 1024)
+        if tmp.stat().st_size != size:
+            tmp.unlink(missing_ok=True)
+            raise SessionBundleError(f"Size mismatch while extracting {arc}")
+        tmp.replace(dest)
+        with lock:
+            written.append(dest)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        try:
+            list(pool.map(place, placements))
+        except Exception:
+            for p in written:
+                p.unlink(missing_ok=True)
+            raise
+    return written
+
+
+def import_bundle(conn: Connection, bundle_path: Path, *, workers: int = DEFAULT_WORKERS) -> BundleResult:
+    """
+    Load a bundle into this database inside conn's transaction. Files are
+    placed before the rows are inserted and removed again if the inserts fail.
+    """
+    _require_postgres(conn)
+    cur = _driver_cursor(conn)
+
+    with zipfile.ZipFile(bundle_path) as z:
+        meta = json.loads(z.read("bundle.json"))
+        if meta.get("format") != BUNDLE_FORMAT:
+            raise SessionBundleError(f"Not a session bundle: {bundle_path}")
+
+        revision = _schema_revision(conn)
+        if meta.get("schema_revision") and revision and meta["schema_revision"] != revision:
+            raise SessionBundleError(
+                f"Bundle schema revision {meta['schema_revision']} does not match this database ({revision}). "
+                "Run alembic upgrade on both sides first."
+            )
+
+        # 1) Stage rows as-is
+        for model, _pk, _fks in _TABLES:
+            table = model.__tablename__
+            cols = meta["tables"][table]
+            conn.execute(text(
+                f"CREATE TEMP TABLE bundle_{table} (LIKE {DB_SCHEMA}.{table}) ON COMMIT DROP"
+            ))
+            with z.open(f"tables/{table}.bin") as src, cur.copy(
+                f"COPY bundle_{table} ({', '.join(cols)}) FROM STDIN (FORMAT binary)"
+            ) as copy:
+                while chunk := src.read(1024 * 1024):
+                    copy.write(chunk)
+
+    # 2) Fresh IDs from the target sequences
+    for model, pk, _fks in _TABLES:
+        if pk is None:
+            continue
+        table = model.__tablename__
+        conn.execute(text(
+            f"CREATE TEMP TABLE bundle_map_{table} ON COMMIT DROP AS "
+            f"SELECT {pk} AS old_id, nextval(pg_get_serial_sequence('{DB_SCHEMA}.{table}', '{pk}')) AS new_id "
+            f"FROM bundle_{table}"
+        ))
+        conn.execute(text(f"CREATE UNIQUE INDEX ON bundle_map_{table} (old_id)"))
+        conn.execute(text(f"ANALYZE bundle_map_{table}"))
+    session_map = dict(conn.execute(text("SELECT old_id, new_id FROM bundle_map_import_session")).all())
+
+    # 3) Paths on this station
+    paths = _new_paths(conn, session_map)
+    conn.execute(text(
+        "CREATE TEMP TABLE bundle_paths (table_name text, old_id bigint, column_name text, new_path text) "
+        "ON COMMIT DROP"
+    ))
+    with cur.copy("COPY bundle_paths FROM STDIN") as copy:
+        for row in paths:
+            copy.write_row(row)
+    conn.execute(text("CREATE INDEX ON bundle_paths (table_name, old_id, column_name)"))
+    conn.execute(text("ANALYZE bundle_paths"))
+
+    new_path = {(t, i, c): Path(p) for t, i, c, p in paths}
+    placements = []
+    for f in meta["files"]:
+        base = new_path[(f["table"], f["old_id"], f["column"])]
+        dest = base / f["rel"] if f["rel"] else base
+        placements.append((f["arc"], dest, f["size_bytes"]))
+
+    written = _place_files(bundle_path, placements, workers)
+
+    # 4) Insert with remapped keys
+    row_counts = {}
+    try:
+        for model, pk, fks in _TABLES:
+            table = model.__tablename__
+            cols = meta["tables"][table]
+            conflict = " ON CONFLICT DO NOTHING" if pk is None else ""
+            result = conn.execute(text(
+                f"INSERT INTO {DB_SCHEMA}.{table} ({', '.join(cols)}) "
+                f"SELECT {_select_list(table, cols, pk, fks)} FROM bundle_{table} t{conflict}"
+            ))
+            row_counts[table] = result.rowcount
+            if table == "import_session":
+                # New session IDs may be past the last media/decisions partition
+                ensure_future_partitions(conn)
+    except Exception:
+        for p in written:
+            p.unlink(missing_ok=True)
+        raise
+
+    return BundleResult(session_ids=session_map, row_counts=row_counts, file_count=len(written))
+
+
+def main() -> None:
+    from src.db.session import build_engine
+
+    parser = argparse.ArgumentParser(description="Export/import import sessions as bundles")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_export = sub.add_parser("export", help="write sessions (rows + files) to a bundle")
+    p_export.add_argument("import_session_ids", type=int, nargs="+")
+    p_export.add_argument("-o", "--output", type=Path, required=True)
+
+    p_import = sub.add_parser("import", help="load a bundle with new IDs")
+    p_import.add_argument("bundle", type=Path)
+    p_import.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="parallel file writers")
+
+    args = parser.parse_args()
+    engine = build_engine()
+
+    with engine.begin() as conn:
+        if args.cmd == "export":
+            result = export_sessions(conn, args.import_session_ids, args.output)
+        else:
+            result = import_bundle(conn, args.bundle, workers=args.workers)
+
+    for table, n in result.row_counts.items():
+        print(f"{table}: {n} row(s)")
+    print(f"{result.file_count} file(s)")
+    if args.cmd == "import":
+        for old, new in sorted(result.session_ids.items()):
+            print(f"session {old} -> {new}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+# Kept apart from src/db/session.py so the sync app does not need greenlet/asyncpg.
+# Uses the same DATABASE_URL and the same src/db/models.py mappings.
+
+def build_async_engine(echo: bool = False) -> AsyncEngine:
+    DATABASE_URL = os.getenv("DATABASE_URL")
+    if not DATABASE_URL:
+        raise RuntimeError("DATABASE_URL is not set. Put in your .env or environment")
+    if make_url(DATABASE_URL).get_backend_name() != "postgresql":
+        raise RuntimeError("The async access path requires PostgreSQL")
+    url = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+    return create_async_engine(url, echo= echo, pool_pre_ping= True)
+
+AsyncSessionLocal = async_sessionmaker(autoflush= False, expire_on_commit= False)
+
+def init_async_session_factory(engine: AsyncEngine) -> None:
+    AsyncSessionLocal.configure(bind = engine)
+
+async def async_db_health_check(engine: AsyncEngine) -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.config import Config
+from src.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# One channel for all sessions, so each web process needs a single LISTEN
+# connection; events carry import_session_id and are fanned out in-process.
+DECISION_CHANNEL = "ipds_decisions"
+
+# pg_notify rejects payloads of 8000 bytes or more, so bulk changes are split.
+# json.dumps escapes non-ASCII, so string length is the byte length.
+_MAX_PAYLOAD_BYTES = 7900
+
+# Events buffered per open page; a page this far behind drops further events
+_LISTENER_QUEUE_SIZE = 1000
+
+# Wait before reconnecting the shared LISTEN connection after an error
+_RECONNECT_SECONDS = 5.0
+
+
+def _payloads(header: dict, items: list[tuple[int, int]]) -> Iterator[str]:
+    """JSON payloads of header plus as many items as fit under _MAX_PAYLOAD_BYTES."""
+    base = len(json.dumps({**header, "items": []}, separators=(",", ":")))
+    chunk: list[list[int]] = []
+    size = base
+    for mid, ver in items:
+        item = [int(mid), int(ver)]
+        item_size = len(json.dumps(item, separators=(",", ":"))) + 1  # plus the comma
+        if chunk and size + item_size > _MAX_PAYLOAD_BYTES:
+            yield json.dumps({**header, "items": chunk}, separators=(",", ":"))
+            chunk, size = [], base
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        yield json.dumps({**header, "items": chunk}, separators=(",", ":"))
+
+
+def notify_decisions(
+        db: Session,
+        *,
+        import_session_id: int,
+        items: list[tuple[int, int]],
+        status: str) -> None:
+    """
+    Queue a decision-change event for the session.
+    Must run inside the writing transaction: Postgres only delivers it on commit.
+
+    items: (media_id, version) pairs as written. Free-text reason and notes are
+    left out: pages only need the new status, and pg_notify payloads are small.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return  # SQLite edge mode: single station, nobody else to tell
+
+    header = {"import_session_id": int(import_session_id), "status": status}
+    for payload in _payloads(header, items):
+        db.execute(select(func.pg_notify(DECISION_CHANNEL, payload)))
+
+
+def decision_events_supported() -> bool:
+    """Live updates need Postgres LISTEN/NOTIFY (not available in SQLite edge mode)."""
+    engine = SessionLocal.kw.get("bind")
+    return engine is not None and engine.dialect.name == "postgresql"
+
+
+class DecisionListener:
+    """One open decide page's subscription to a session's decision events."""
+
+    def __init__(self, hub: "_DecisionHub", import_session_id: int) -> None:
+        self._hub = hub
+        self.import_session_id = import_session_id
+        self.queue: queue.Queue[dict] = queue.Queue(maxsize=_LISTENER_QUEUE_SIZE)
+
+    def events(
+            self,
+            *,
+            heartbeat_seconds: float = 15.0,
+            max_seconds: float = Config.DECISION_EVENTS_MAX_SECONDS) -> Iterator[dict | None]:
+        """
+        Yield events as they are committed, None every heartbeat_seconds
+        without traffic (so the caller notices a closed client), and stop after
+        max_seconds so no stream holds a worker indefinitely; EventSource
+        reconnects on its own.
+        """
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                yield self.queue.get(timeout=min(heartbeat_seconds, remaining))
+            except queue.Empty:
+                yield None
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+
+class _DecisionHub:
+    """
+    Per-process fan-out of decision events: one dedicated LISTEN connection
+    (detached from the pool, since it is held for the life of the process)
+    shared by every open decide page.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners: dict[int, set[DecisionListener]] = {}
+        self._count = 0
+        self._thread: threading.Thread | None = None
+
+    def subscribe(self, import_session_id: int) -> DecisionListener | None:
+        """None when this process already serves DECISION_EVENTS_MAX_LISTENERS pages."""
+        with self._lock:
+            if self._count >= Config.DECISION_EVENTS_MAX_LISTENERS:
+                return None
+            listener = DecisionListener(self, int(import_session_id))
+            self._listeners.setdefault(listener.import_session_id, set()).add(listener)
+            self._count += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="decision-events", daemon=True)
+                self._thread.start()
+            return listener
+
+    def unsubscribe(self, listener: DecisionListener) -> None:
+        with self._lock:
+            listeners = self._listeners.get(listener.import_session_id)
+            if listeners is None or listener not in listeners:
+                return
+            listeners.discard(listener)
+            if not listeners:
+                del self._listeners[listener.import_session_id]
+            self._count -= 1
+
+    def _dispatch(self, payload: str) -> None:
+        event = json.loads(payload)
+        with self._lock:
+            listeners = list(self._listeners.get(event.get("import_session_id"), ()))
+        for listener in listeners:
+            try:
+                listener.queue.put_nowait(event)
+            except queue.Full:
+                logger.warning("decision events: dropped event for a stalled listener")
+
+    def _listen(self) -> None:
+        engine = SessionLocal.kw.get("bind")
+        raw = engine.raw_connection()
+        conn = raw.driver_connection
+        raw.detach()
+        try:
+            conn.autocommit = True
+            conn.execute(f"LISTEN {DECISION_CHANNEL}")
+            for n in conn.notifies():
+                self._dispatch(n.payload)
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("decision events: LISTEN connection failed, reconnecting")
+            time.sleep(_RECONNECT_SECONDS)
+
+
+_hub = _DecisionHub()
+
+
+def open_decision_listener(import_session_id: int) -> DecisionListener | None:
+    """
+    Subscribe to decision changes for one session. Returns None when the
+    per-process listener cap is reached. Callers must close() the listener.
+    """
+    return _hub.subscribe(import_session_id)
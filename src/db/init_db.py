@@ -11,11 +11,17 @@ from src.db.models import (
     Decisions,
     Exports,
     LocalArchives,
+    ExportItems,
+    DecisionRollupHourly,
+    RollupState,
 )
 
 
 def init_db(engine) -> None:
-    with engine.begin() as conn:
-        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA};"))
+    # SQLite edge mode attaches the database file as the schema instead
+    if engine.dialect.name != "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DB_SCHEMA};"))
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm;"))
 
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 from sqlalchemy import (
-    BigInteger, Boolean, CheckConstraint, ForeignKey, Index, Text, UniqueConstraint, func
+    BigInteger, Boolean, CheckConstraint, DateTime, Float, ForeignKey, Index, Text, UniqueConstraint, func
 )
-from sqlalchemy.dialects.postgresql import TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.db.base import Base, DB_SCHEMA
 
 def timestamptz():
-    return TIMESTAMP(timezone=True)
+    # TIMESTAMPTZ on Postgres, DATETIME on SQLite edge installs
+    return DateTime(timezone=True)
+
+def trigram_index(name: str, column: str) -> Index:
+    # pg_trgm GIN index for prefix/substring search; Postgres only
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
 
 class Jobs(Base):
     __tablename__ = "jobs"
     __table_args__ = (
         CheckConstraint("status IN ('open','closed','cancelled')", name="jobs_status_chk"),
+        trigram_index("idx_jobs_job_id_trgm", "job_id"),
         {"schema": DB_SCHEMA},
     )
 
@@ -46,6 +53,7 @@ class ImportSession(Base):
         Index("idx_import_session_operator_id", "operator_id"),
         Index("idx_import_session_job_id", "job_id"),
         Index("idx_import_session_uut_serial", "uut_serial"),
+        trigram_index("idx_import_session_uut_serial_trgm", "uut_serial"),
         {"schema": DB_SCHEMA},
     )
 
@@ -75,6 +83,9 @@ class ImportSession(Base):
 class Media(Base):
     __tablename__ = "media"
     __table_args__ = (
+        # On partitioned Postgres this key is enforced through ipds.media_dedupe
+        # (Alembic revision b5c1e7d94a30), since partitioned unique keys must
+        # include import_session_id
         UniqueConstraint("adapter", "vendor_id", name="media_dedupe_uq"),
         Index("idx_media_import_session_id", "import_session_id"),
         Index("idx_media_imported_at", "imported_at"),
@@ -101,8 +112,11 @@ class Media(Base):
 class Decisions(Base):
     __tablename__ = "decisions"
     __table_args__ = (
-        UniqueConstraint("media_id", name="decisions_one_per_media_uq"),
+        # Includes import_session_id so it stays valid when the table is range-partitioned
+        UniqueConstraint("import_session_id", "media_id", name="decisions_one_per_media_uq"),
         CheckConstraint("status IN ('accepted','rejected')", name="decisions_status_chk"),
+        Index("idx_decisions_decided_at", "decided_at"),
+        Index("idx_decisions_updated_at", "updated_at"),
         {"schema": DB_SCHEMA},
     )
 
@@ -111,10 +125,17 @@ class Decisions(Base):
         BigInteger, ForeignKey(f"{DB_SCHEMA}.media.media_id", onupdate="CASCADE", ondelete="RESTRICT"),
         nullable=False
     )
+    import_session_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey(f"{DB_SCHEMA}.import_session.import_session_id", onupdate="CASCADE", ondelete="RESTRICT"),
+        nullable=False
+    )
     status: Mapped[str] = mapped_column(Text, nullable=False)
     reason: Mapped[str | None] = mapped_column(Text)
     decided_at: Mapped[object] = mapped_column(timestamptz(), nullable=False, server_default=func.now())
     notes: Mapped[str | None] = mapped_column(Text)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="1")
+    # Last write time; drives incremental refresh of the analytics rollups
+    updated_at: Mapped[object] = mapped_column(timestamptz(), nullable=False, server_default=func.now())
 
     media: Mapped["Media"] = relationship(back_populates="decision")
 
@@ -140,6 +161,33 @@ class Exports(Base):
 
     import_session: Mapped["ImportSession"] = relationship(back_populates="exports")
     local_archive: Mapped["LocalArchives | None"] = relationship(back_populates="export", uselist=False)
+    items: Mapped[list["ExportItems"]] = relationship(back_populates="export")
+
+
+class ExportItems(Base):
+    """One row per photo written into an export ZIP (mirrors the manifest files list)."""
+    __tablename__ = "export_items"
+    __table_args__ = (
+        Index("idx_export_items_media_id", "media_id"),
+        Index("idx_export_items_sha256", "sha256"),
+        {"schema": DB_SCHEMA},
+    )
+
+    export_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey(f"{DB_SCHEMA}.exports.export_id", onupdate="CASCADE", ondelete="CASCADE"),
+        primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    import_session_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    media_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey(f"{DB_SCHEMA}.media.media_id", onupdate="CASCADE", ondelete="RESTRICT"),
+        nullable=False
+    )
+    export_name: Mapped[str] = mapped_column(Text, nullable=False)
+    sha256: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    export: Mapped["Exports"] = relationship(back_populates="items")
 
 
 
@@ -162,3 +210,28 @@ class LocalArchives(Base):
     created_at: Mapped[object] = mapped_column(timestamptz(), nullable=False, server_default=func.now())
 
     export: Mapped["Exports"] = relationship(back_populates="local_archive")
+
+
+class DecisionRollupHourly(Base):
+    """Decisions per hour, operator, status and normalised reason. Rebuilt by src.db.rollups."""
+    __tablename__ = "decision_rollup_hourly"
+    __table_args__ = (
+        Index("idx_decision_rollup_hourly_operator", "operator_id", "bucket_start"),
+        {"schema": DB_SCHEMA},
+    )
+
+    bucket_start: Mapped[object] = mapped_column(timestamptz(), primary_key=True)
+    operator_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    status: Mapped[str] = mapped_column(Text, primary_key=True)
+    reason: Mapped[str] = mapped_column(Text, primary_key=True)
+    decision_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ingest_to_decision_seconds_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    ingest_to_decision_seconds_max: Mapped[float] = mapped_column(Float, nullable=False)
+
+
+class RollupState(Base):
+    __tablename__ = "rollup_state"
+    __table_args__ = ({"schema": DB_SCHEMA},)
+
+    name: Mapped[str] = mapped_column(Text, primary_key=True)
+    refreshed_through: Mapped[object] = mapped_column(timestamptz(), nullable=False)
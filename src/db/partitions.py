@@ -0,0 +1,218 @@
+"""
+Range partitioning helpers for ipds.media and ipds.decisions.
+
+Both tables are partitioned by RANGE (import_session_id) once the
+partitioning Alembic revision has run. Session IDs only grow, so each
+partition is effectively a slice of station history, and a session's media
+and decisions always land in partitions with the same bounds.
+
+Partitions are named <table>_s<lo>_<hi> and cover [lo, hi).
+
+Usage:
+    python -m src.db.partitions ensure [--ahead N]
+    python -m src.db.partitions detach --before <import_session_id> [--archive-schema NAME]
+
+Everything here is a no-op on databases where the tables are not
+partitioned (plain create_all installs, SQLite).
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from src.config import Config
+from src.db.base import DB_SCHEMA
+
+# Number of import sessions per partition
+SESSION_SPAN = Config.PARTITION_SESSION_SPAN
+
+# Partitions kept ready beyond the newest session
+DEFAULT_AHEAD = 3
+
+DEFAULT_ARCHIVE_SCHEMA = f"{DB_SCHEMA}_archive"
+
+# Detach order matters: decisions reference media.
+PARTITIONED_TABLES = ("decisions", "media")
+
+_BOUND_RE = re.compile(r"FROM \('?(-?\d+)'?\) TO \('?(-?\d+)'?\)")
+
+
+def partition_name(table: str, lo: int, hi: int) -> str:
+    return f"{table}_s{lo}_{hi}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    row = conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = :schema AND c.relname = :table"
+        ),
+        {"schema": DB_SCHEMA, "table": table},
+    ).first()
+    return row is not None
+
+
+def list_partitions(conn: Connection, table: str) -> list[tuple[str, int, int]]:
+    """Attached partitions of a table as (name, lo, hi), ordered by lo."""
+    rows = conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "JOIN pg_namespace n ON n.oid = p.relnamespace "
+            "WHERE n.nspname = :schema AND p.relname = :table"
+        ),
+        {"schema": DB_SCHEMA, "table": table},
+    ).all()
+
+    out = []
+    for name, bound in rows:
+        m = _BOUND_RE.search(bound or "")
+        if m:
+            out.append((name, int(m.group(1)), int(m.group(2))))
+    return sorted(out, key=lambda r: r[1])
+
+
+def _lock(conn: Connection) -> None:
+    # Serialise partition DDL between concurrent ingests/workers
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('ipds_partitions'))"))
+
+
+def create_partition_range(conn: Connection, lo: int, hi: int) -> list[str]:
+    created = []
+    for table in reversed(PARTITIONED_TABLES):  # media before decisions
+        name = partition_name(table, lo, hi)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {DB_SCHEMA}.{name} "
+            f"PARTITION OF {DB_SCHEMA}.{table} FOR VALUES FROM ({int(lo)}) TO ({int(hi)})"
+        ))
+        created.append(name)
+    return created
+
+
+def ensure_future_partitions(conn: Connection, *, ahead: int = DEFAULT_AHEAD, span: int = SESSION_SPAN) -> list[str]:
+    """
+    Make sure partitions exist up to `ahead` spans past the newest session.
+    Only extends upward from the highest attached partition, so detached
+    (archived) ranges are never re-created.
+    """
+    if not is_partitioned(conn, "media"):
+        return []
+
+    _lock(conn)
+
+    max_id = conn.execute(
+        text(f"SELECT COALESCE(MAX(import_session_id), 0) FROM {DB_SCHEMA}.import_session")
+    ).scalar_one()
+
+    existing = list_partitions(conn, "media")
+    lo = existing[-1][2] if existing else (int(max_id) // span) * span
+    target_hi = (int(max_id) // span + 1 + ahead) * span
+
+    created = []
+    while lo < target_hi:
+        created.extend(create_partition_range(conn, lo, lo + span))
+        lo += span
+    return created
+
+
+def detach_partitions_before(
+    conn: Connection,
+    *,
+    before_session_id: int,
+    archive_schema: str = DEFAULT_ARCHIVE_SCHEMA,
+) -> list[str]:
+    """
+    Detach partitions whose whole range is below before_session_id and move
+    them into archive_schema. Ranges that still hold running sessions are kept.
+    Detached tables stay queryable as <archive_schema>.<table>_s<lo>_<hi>.
+    """
+    if not is_partitioned(conn, "media"):
+        return []
+
+    _lock(conn)
+    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+
+    moved = []
+    for _name, lo, hi in list_partitions(conn, "media"):
+        if hi > before_session_id:
+            continue
+
+        running = conn.execute(
+            text(
+                f"SELECT 1 FROM {DB_SCHEMA}.import_session "
+                "WHERE status = 'running' AND import_session_id >= :lo AND import_session_id < :hi "
+                "LIMIT 1"
+            ),
+            {"lo": lo, "hi": hi},
+        ).first()
+        if running:
+            continue
+
+        for table in PARTITIONED_TABLES:
+            name = partition_name(table, lo, hi)
+            conn.execute(text(f"ALTER TABLE {DB_SCHEMA}.{table} DETACH PARTITION {DB_SCHEMA}.{name}"))
+            _drop_media_fks(conn, name)
+            conn.execute(text(f"ALTER TABLE {DB_SCHEMA}.{name} SET SCHEMA {archive_schema}"))
+            moved.append(f"{archive_schema}.{name}")
+    return moved
+
+
+def _drop_media_fks(conn: Connection, name: str) -> None:
+    # A detached decisions partition keeps its FK to the live media parent,
+    # which would pin the archived rows to it. Archived tables are history.
+    fks = conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid = CAST(:rel AS regclass) AND confrelid = CAST(:media AS regclass)"
+        ),
+        {"rel": f"{DB_SCHEMA}.{name}", "media": f"{DB_SCHEMA}.media"},
+    ).scalars().all()
+    for fk in fks:
+        conn.execute(text(f'ALTER TABLE {DB_SCHEMA}.{name} DROP CONSTRAINT "{fk}"'))
+
+
+def main() -> None:
+    from src.db.session import build_engine
+
+    parser = argparse.ArgumentParser(description="Manage media/decisions partitions")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_ensure = sub.add_parser("ensure", help="create upcoming partitions")
+    p_ensure.add_argument("--ahead", type=int, default=DEFAULT_AHEAD)
+
+    p_detach = sub.add_parser("detach", help="move old partitions to the archive schema")
+    p_detach.add_argument("--before", type=int, required=True, help="import_session_id upper bound")
+    p_detach.add_argument("--archive-schema", default=DEFAULT_ARCHIVE_SCHEMA)
+
+    args = parser.parse_args()
+    engine = build_engine()
+
+    with engine.begin() as conn:
+        if args.cmd == "ensure":
+            names = ensure_future_partitions(conn, ahead=args.ahead)
+        else:
+            names = detach_partitions_before(
+                conn,
+                before_session_id=args.before,
+                archive_schema=args.archive_schema,
+            )
+
+    for name in names:
+        print(name)
+    print(f"{len(names)} table(s) affected")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
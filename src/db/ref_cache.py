@@ -0,0 +1,171 @@
+"""
+Process-local cache for reference lookups that hardly change during review:
+operators, open jobs and import session headers.
+
+Entries are immutable snapshots (not ORM objects), so they are safe to share
+between requests and threads. Each entry expires after REF_CACHE_TTL_SECONDS;
+routes that change the underlying rows invalidate explicitly:
+- complete / cancel / amend session -> invalidate_session(id)
+- create / close job               -> invalidate_jobs()
+
+Invalidation is per process. With several workers, another worker can serve a
+stale entry for at most one TTL, so keep the TTL short.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.config import Config
+from src.db.models import ImportSession, Jobs, Operators
+
+REF_CACHE_TTL_SECONDS = Config.REF_CACHE_TTL_SECONDS
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """Thread-safe dict with per-entry expiry and hit/miss counters. Misses (None) are not stored."""
+
+    def __init__(self, name: str, ttl_seconds: float = REF_CACHE_TTL_SECONDS):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._data: dict[Hashable, tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], T | None]) -> T | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]  # type: ignore[return-value]
+            self.misses += 1
+
+        # Load outside the lock; two threads racing on a miss both query, last one wins
+        value = loader()
+        if value is not None and self.ttl_seconds > 0:
+            with self._lock:
+                self._data[key] = (now + self.ttl_seconds, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+@dataclass(frozen=True, slots=True)
+class OperatorRef:
+    operator_id: str
+    name: str
+    role: str | None
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class JobRef:
+    job_id: str
+    status: str
+    created_at: object
+
+
+@dataclass(frozen=True, slots=True)
+class SessionHeader:
+    import_session_id: int
+    job_id: str
+    operator_id: str
+    uut_serial: str
+    status: str
+    session_purpose: str
+    started_at: object
+    ended_at: object | None
+
+
+_operators = TTLCache("operators")
+_open_jobs = TTLCache("open_jobs")
+_session_headers = TTLCache("session_headers")
+
+_OPEN_JOBS_KEY = "all"
+
+
+def get_operator(db: Session, operator_id: str) -> OperatorRef | None:
+    def load():
+        row = db.execute(
+            select(Operators.operator_id, Operators.name, Operators.role, Operators.is_active)
+            .where(Operators.operator_id == operator_id)
+        ).first()
+        return OperatorRef(*row) if row else None
+
+    return _operators.get_or_load(operator_id, load)
+
+
+def list_open_jobs(db: Session) -> list[JobRef]:
+    """Jobs that are not closed, newest job_id first."""
+    def load():
+        rows = db.execute(
+            select(Jobs.job_id, Jobs.status, Jobs.created_at)
+            .where(Jobs.status != "closed")
+            .order_by(Jobs.job_id.desc())
+        ).all()
+        return tuple(JobRef(*row) for row in rows)
+
+    return list(_open_jobs.get_or_load(_OPEN_JOBS_KEY, load))
+
+
+def get_session_header(db: Session, import_session_id: int) -> SessionHeader | None:
+    def load():
+        row = db.execute(
+            select(
+                ImportSession.import_session_id,
+                ImportSession.job_id,
+                ImportSession.operator_id,
+                ImportSession.uut_serial,
+                ImportSession.status,
+                ImportSession.session_purpose,
+                ImportSession.started_at,
+                ImportSession.ended_at,
+            ).where(ImportSession.import_session_id == import_session_id)
+        ).first()
+        return SessionHeader(*row) if row else None
+
+    return _session_headers.get_or_load(int(import_session_id), load)
+
+
+def invalidate_session(import_session_id: int) -> None:
+    _session_headers.invalidate(int(import_session_id))
+
+
+def invalidate_jobs() -> None:
+    _open_jobs.clear()
+
+
+def clear_all() -> None:
+    for cache in (_operators, _open_jobs, _session_headers):
+        cache.clear()
+
+
+def cache_stats() -> dict[str, dict]:
+    return {cache.name: cache.stats() for cache in (_operators, _open_jobs, _session_headers)}
@@ -1,43 +1,154 @@
 from __future__ import annotations
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
+from src.db.decision_events import notify_decisions
 from src.db.models import Decisions
 
-def upsert_decision(
-        db: Session, 
-        *, 
-        media_id: int, 
-        status: str,  
-        reason: str | None = None, 
-        notes: str | None = None) -> Decisions:
-    
-    row = Decisions(
-        media_id=media_id,
-        status=status,
-        reason=reason,
-        notes=notes,
+# Rows per multi-row INSERT: 5 bind parameters each, well under the 65535
+# (psycopg) and 32766 (SQLite) parameter limits
+_UPSERT_BATCH_ROWS = 2000
+
+
+def _insert(db: Session):
+    # Both dialects support INSERT ... ON CONFLICT with the same API
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(Decisions)
+    return postgresql.insert(Decisions)
+
+
+def _upsert_stmt(db: Session, values: list[dict]):
+    """
+    INSERT ... ON CONFLICT (import_session_id, media_id) DO UPDATE for one or many decision rows.
+    decided_at keeps its original value on update, same as the old ORM path.
+    Every write bumps version and updated_at.
+    """
+    stmt = _insert(db).values(values)
+    return stmt.on_conflict_do_update(
+        index_elements=[Decisions.import_session_id, Decisions.media_id],
+        set_={
+            "status": stmt.excluded.status,
+            "reason": stmt.excluded.reason,
+            "notes": stmt.excluded.notes,
+            "version": Decisions.__table__.c.version + 1,
+            "updated_at": func.now(),
+        },
     )
 
-    db.add(row)
 
-    try:
-        db.commit()
-        db.refresh(row)
-        return row
-    except IntegrityError:
+def upsert_decision(
+        db: Session,
+        *,
+        import_session_id: int,
+        media_id: int,
+        status: str,
+        reason: str | None = None,
+        notes: str | None = None,
+        expected_version: int | None = None,
+        notify: bool = True) -> Decisions | None:
+    """
+    expected_version:
+        None -> last write wins
+        0    -> only insert; the caller saw the media undecided
+        N    -> only update if the stored row is still at version N
+    Returns None (and writes nothing) when the expected version no longer matches.
+
+    notify: publish the change on the session channel.
+    """
+    values = {
+        "import_session_id": import_session_id,
+        "media_id": media_id,
+        "status": status,
+        "reason": reason,
+        "notes": notes,
+    }
+
+    if expected_version is None:
+        stmt = _upsert_stmt(db, [values])
+    elif expected_version == 0:
+        stmt = (
+            _insert(db)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[Decisions.import_session_id, Decisions.media_id])
+        )
+    else:
+        stmt = (
+            update(Decisions)
+            .where(
+                Decisions.import_session_id == import_session_id,
+                Decisions.media_id == media_id,
+                Decisions.version == expected_version,
+            )
+            .values(
+                status=status,
+                reason=reason,
+                notes=notes,
+                version=Decisions.version + 1,
+                updated_at=func.now(),
+            )
+        )
+
+    row = db.scalars(
+        stmt.returning(Decisions),
+        execution_options={"populate_existing": True},
+    ).one_or_none()
+
+    if row is None:
         db.rollback()
-        existing = db.scalar(select(Decisions).where(Decisions.media_id == media_id))
-        if existing is None:
-            raise 
-        existing.status = status
-        existing.reason = reason
-        existing.notes = notes
-        db.commit()
-        db.refresh(existing)
-        return existing
+        return None
+
+    if notify:
+        notify_decisions(
+            db,
+            import_session_id=import_session_id,
+            items=[(row.media_id, row.version)],
+            status=status,
+        )
+    db.commit()
+    return row
 
 
-    
\ No newline at end of file
+def bulk_upsert_decisions(
+        db: Session,
+        *,
+        import_session_id: int,
+        media_ids: list[int],
+        status: str,
+        reason: str | None = None,
+        notes: str | None = None,
+        notify: bool = True) -> int:
+    """
+    Set-based upsert for many media in a single commit, one statement per
+    _UPSERT_BATCH_ROWS rows. Either every row is written or none is.
+    """
+    if not media_ids:
+        return 0
+
+    try:
+        items: list[tuple[int, int]] = []
+        for i in range(0, len(media_ids), _UPSERT_BATCH_ROWS):
+            stmt = _upsert_stmt(db, [
+                {
+                    "import_session_id": import_session_id,
+                    "media_id": mid,
+                    "status": status,
+                    "reason": reason,
+                    "notes": notes,
+                }
+                for mid in media_ids[i:i + _UPSERT_BATCH_ROWS]
+            ]).returning(Decisions.media_id, Decisions.version)
+            items.extend((mid, ver) for mid, ver in db.execute(stmt))
+        if notify:
+            notify_decisions(
+                db,
+                import_session_id=import_session_id,
+                items=items,
+                status=status,
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(items)
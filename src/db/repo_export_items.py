@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.db.models import ExportItems, Exports
+
+
+@dataclass(frozen=True, slots=True)
+class ExportItemLineage:
+    export_id: int
+    export_path: str
+    export_status: str
+    exported_at: object
+    seq: int
+    media_id: int
+    export_name: str
+    sha256: str
+    size_bytes: int
+
+
+def _lineage_stmt():
+    return (
+        select(
+            Exports.export_id,
+            Exports.export_path,
+            Exports.status,
+            Exports.created_at,
+            ExportItems.seq,
+            ExportItems.media_id,
+            ExportItems.export_name,
+            ExportItems.sha256,
+            ExportItems.size_bytes,
+        )
+        .join(Exports, Exports.export_id == ExportItems.export_id)
+        .order_by(Exports.created_at.desc(), ExportItems.seq)
+    )
+
+
+def exports_containing_media(db: Session, media_id: int) -> list[ExportItemLineage]:
+    """Every export ZIP a media item was written into, newest first."""
+    rows = db.execute(_lineage_stmt().where(ExportItems.media_id == media_id)).all()
+    return [ExportItemLineage(*row) for row in rows]
+
+
+def find_export_items_by_sha256(db: Session, sha256: str) -> list[ExportItemLineage]:
+    """Which ZIP(s) hold a file with this content hash."""
+    rows = db.execute(_lineage_stmt().where(ExportItems.sha256 == sha256.strip().lower())).all()
+    return [ExportItemLineage(*row) for row in rows]
+
+
+def diff_exports(db: Session, old_export_id: int, new_export_id: int) -> dict[str, list[int]]:
+    """
+    Media added to / removed from new_export_id compared with old_export_id.
+    Compared by media_id: exported bytes differ between exports (each burns its own watermark).
+    """
+    rows = db.execute(
+        select(ExportItems.export_id, ExportItems.media_id)
+        .where(ExportItems.export_id.in_((old_export_id, new_export_id)))
+    ).all()
+
+    old = {mid for eid, mid in rows if eid == old_export_id}
+    new = {mid for eid, mid in rows if eid == new_export_id}
+    return {
+        "added": sorted(new - old),
+        "removed": sorted(old - new),
+    }
@@ -36,7 +36,14 @@ def insert_media_idempotent(
         return row, True
     except IntegrityError:
         db.rollback()
+        # Earliest import: partitioned databases may hold legacy cross-session duplicates
         existing = db.execute(
-            select(Media).where(Media.adapter == adapter, Media.vendor_id == vendor_id)
-        ).scalar_one()
+            select(Media)
+            .where(Media.adapter == adapter, Media.vendor_id == vendor_id)
+            .order_by(Media.media_id)
+            .limit(1)
+        ).scalar_one_or_none()
+        if existing is None:
+            # Claimed in ipds.media_dedupe by media in a detached (archived) partition
+            raise
         return existing, False
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Hourly analytics rollups over ipds.decisions.
+
+ipds.decision_rollup_hourly holds one row per
+(hour of decided_at, operator, status, normalised reason) with the decision
+count and the ingest-to-decision time (sum and max, in seconds). Analytics
+pages read only this table.
+
+Refresh is incremental: every decision write stamps decisions.updated_at,
+and a refresh re-aggregates just the hours of decisions written since the
+last run. The first run (or --full) rebuilds everything.
+
+Usage (run every few minutes from cron / a systemd timer):
+    python -m src.db.rollups refresh [--full]
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.engine import Connection
+
+from src.db.models import DecisionRollupHourly, Decisions, ImportSession, Media, RollupState
+
+ROLLUP_NAME = "decision_rollup_hourly"
+
+# Writes from transactions that started up to this long before the previous
+# refresh (and committed after it) are still picked up.
+REFRESH_OVERLAP = timedelta(minutes=10)
+
+_ROLLUP_COLUMNS = (
+    "bucket_start",
+    "operator_id",
+    "status",
+    "reason",
+    "decision_count",
+    "ingest_to_decision_seconds_sum",
+    "ingest_to_decision_seconds_max",
+)
+
+
+# SQLite keeps timestamps as text; buckets use SQLAlchemy's DATETIME text format
+# so they compare equal to bound datetime parameters.
+_SQLITE_HOUR_FORMAT = "%Y-%m-%d %H:00:00.000000"
+
+
+def _hour_bucket(dialect: str, col):
+    if dialect == "sqlite":
+        return func.strftime(_SQLITE_HOUR_FORMAT, col)
+    return func.date_trunc("hour", col)
+
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _seconds_between(dialect: str, later, earlier):
+    if dialect == "sqlite":
+        return (func.julianday(later) - func.julianday(earlier)) * 86400.0
+    return func.extract("epoch", later - earlier)
+
+
+def _in_bucket(dialect: str, hour):
+    if dialect == "sqlite":
+        # Stored text timestamps vary in precision, so compare on the bucket itself
+        return _hour_bucket(dialect, Decisions.decided_at) == hour.strftime(_SQLITE_HOUR_FORMAT)
+    # Range keeps idx_decisions_decided_at usable
+    return (Decisions.decided_at >= hour) & (Decisions.decided_at < hour + timedelta(hours=1))
+
+
+def _aggregate_stmt(dialect: str, *where):
+    bucket = _hour_bucket(dialect, Decisions.decided_at)
+    reason = func.lower(func.trim(func.coalesce(Decisions.reason, "")))
+    # Clock skew between ingest and review hosts must not produce negative waits
+    larger = func.max if dialect == "sqlite" else func.greatest
+    seconds = larger(_seconds_between(dialect, Decisions.decided_at, Media.imported_at), 0)
+
+    return (
+        select(
+            bucket,
+            ImportSession.operator_id,
+            Decisions.status,
+            reason,
+            func.count(),
+            func.coalesce(func.sum(seconds), 0),
+            func.coalesce(func.max(seconds), 0),
+        )
+        .join(
+            Media,
+            (Media.media_id == Decisions.media_id)
+            & (Media.import_session_id == Decisions.import_session_id),
+        )
+        .join(ImportSession, ImportSession.import_session_id == Decisions.import_session_id)
+        .where(*where)
+        .group_by(bucket, ImportSession.operator_id, Decisions.status, reason)
+    )
+
+
+def _insert_rollups(conn: Connection, *where) -> None:
+    conn.execute(
+        insert(DecisionRollupHourly).from_select(
+            _ROLLUP_COLUMNS, _aggregate_stmt(conn.dialect.name, *where)
+        )
+    )
+
+
+def refresh_decision_rollups(conn: Connection, *, full: bool = False) -> int:
+    """
+    Bring decision_rollup_hourly up to date. Returns the number of hours
+    re-aggregated (-1 for a full rebuild). Run inside one transaction, so
+    readers never see a half-refreshed hour.
+    """
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # One refresher at a time
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('ipds_rollups'))"))
+
+    started = _as_datetime(conn.execute(select(func.now())).scalar_one())
+    last = conn.execute(
+        select(RollupState.refreshed_through).where(RollupState.name == ROLLUP_NAME)
+    ).scalar_one_or_none()
+
+    if full or last is None:
+        conn.execute(delete(DecisionRollupHourly))
+        _insert_rollups(conn)
+        refreshed = -1
+    else:
+        hours = conn.execute(
+            select(_hour_bucket(dialect, Decisions.decided_at))
+            .where(Decisions.updated_at > last - REFRESH_OVERLAP)
+            .distinct()
+        ).scalars().all()
+
+        for hour in map(_as_datetime, hours):
+            conn.execute(delete(DecisionRollupHourly).where(DecisionRollupHourly.bucket_start == hour))
+            _insert_rollups(conn, _in_bucket(dialect, hour))
+        refreshed = len(hours)
+
+    conn.execute(delete(RollupState).where(RollupState.name == ROLLUP_NAME))
+    conn.execute(insert(RollupState).values(name=ROLLUP_NAME, refreshed_through=started))
+    return refreshed
+
+
+def main() -> None:
+    from src.db.session import build_engine
+
+    parser = argparse.ArgumentParser(description="Refresh analytics rollup tables")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_refresh = sub.add_parser("refresh", help="re-aggregate hours changed since the last refresh")
+    p_refresh.add_argument("--full", action="store_true", help="rebuild all rollups from scratch")
+
+    args = parser.parse_args()
+    engine = build_engine()
+
+    with engine.begin() as conn:
+        refreshed = refresh_decision_rollups(conn, full=args.full)
+
+    if refreshed < 0:
+        print("rollups rebuilt")
+    else:
+        print(f"{refreshed} hour(s) refreshed")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    main()
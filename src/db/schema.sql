@@ -1,4 +1,5 @@
 CREATE SCHEMA IF NOT EXISTS ipds;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- =========================
 -- JOBS 
@@ -10,6 +11,8 @@ CREATE TABLE IF NOT EXISTS ipds.jobs (
   CONSTRAINT jobs_status_chk CHECK (status IN ('open', 'closed', 'cancelled'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_jobs_job_id_trgm ON ipds.jobs USING gin (job_id gin_trgm_ops);
+
 -- =========================
 -- OPERATORS 
 -- =========================
@@ -41,6 +44,7 @@ CREATE TABLE IF NOT EXISTS ipds.import_session (
 CREATE INDEX IF NOT EXISTS idx_import_session_operator_id ON ipds.import_session(operator_id);
 CREATE INDEX IF NOT EXISTS idx_import_session_job_id      ON ipds.import_session(job_id);
 CREATE INDEX IF NOT EXISTS idx_import_session_uut_serial  ON ipds.import_session(uut_serial);
+CREATE INDEX IF NOT EXISTS idx_import_session_uut_serial_trgm ON ipds.import_session USING gin (uut_serial gin_trgm_ops);
 
 -- =========================
 -- MEDIA 
@@ -67,14 +71,20 @@ CREATE INDEX IF NOT EXISTS idx_media_imported_at       ON ipds.media(imported_at
 CREATE TABLE IF NOT EXISTS ipds.decisions (
   decision_id BIGSERIAL PRIMARY KEY,
   media_id    BIGINT NOT NULL REFERENCES ipds.media(media_id) ON UPDATE CASCADE ON DELETE RESTRICT,
+  import_session_id BIGINT NOT NULL REFERENCES ipds.import_session(import_session_id) ON UPDATE CASCADE ON DELETE RESTRICT,
   status      TEXT NOT NULL,
   reason      TEXT,
   decided_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
   notes       TEXT,
-  CONSTRAINT decisions_one_per_media_uq UNIQUE (media_id),
+  version     BIGINT NOT NULL DEFAULT 1,
+  updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  CONSTRAINT decisions_one_per_media_uq UNIQUE (import_session_id, media_id),
   CONSTRAINT decisions_status_chk CHECK (status IN ('accepted', 'rejected'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_decisions_decided_at ON ipds.decisions(decided_at);
+CREATE INDEX IF NOT EXISTS idx_decisions_updated_at ON ipds.decisions(updated_at);
+
 -- =========================
 -- EXPORTS 
 -- =========================
@@ -91,6 +101,23 @@ CREATE TABLE IF NOT EXISTS ipds.exports (
 
 CREATE INDEX IF NOT EXISTS idx_exports_import_session_id ON ipds.exports(import_session_id);
 
+-- =========================
+-- EXPORT_ITEMS
+-- =========================
+CREATE TABLE IF NOT EXISTS ipds.export_items (
+  export_id         BIGINT NOT NULL REFERENCES ipds.exports(export_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  seq               BIGINT NOT NULL,
+  import_session_id BIGINT NOT NULL,
+  media_id          BIGINT NOT NULL REFERENCES ipds.media(media_id) ON UPDATE CASCADE ON DELETE RESTRICT,
+  export_name       TEXT NOT NULL,
+  sha256            TEXT NOT NULL,
+  size_bytes        BIGINT NOT NULL,
+  PRIMARY KEY (export_id, seq)
+);
+
+CREATE INDEX IF NOT EXISTS idx_export_items_media_id ON ipds.export_items(media_id);
+CREATE INDEX IF NOT EXISTS idx_export_items_sha256   ON ipds.export_items(sha256);
+
 -- =========================
 -- LOCAL_ARCHIVES 
 -- =========================
@@ -104,3 +131,24 @@ CREATE TABLE IF NOT EXISTS ipds.local_archives (
   CONSTRAINT local_archives_one_per_export_uq UNIQUE (export_id),
   CONSTRAINT local_archives_verify_status_chk CHECK (verify_status IN ('pending','verified','failed'))
 );
+
+-- =========================
+-- ANALYTICS ROLLUPS
+-- =========================
+CREATE TABLE IF NOT EXISTS ipds.decision_rollup_hourly (
+  bucket_start                    TIMESTAMPTZ NOT NULL,
+  operator_id                     TEXT NOT NULL,
+  status                          TEXT NOT NULL,
+  reason                          TEXT NOT NULL,
+  decision_count                  BIGINT NOT NULL,
+  ingest_to_decision_seconds_sum  DOUBLE PRECISION NOT NULL,
+  ingest_to_decision_seconds_max  DOUBLE PRECISION NOT NULL,
+  PRIMARY KEY (bucket_start, operator_id, status, reason)
+);
+
+CREATE INDEX IF NOT EXISTS idx_decision_rollup_hourly_operator ON ipds.decision_rollup_hourly(operator_id, bucket_start);
+
+CREATE TABLE IF NOT EXISTS ipds.rollup_state (
+  name               TEXT PRIMARY KEY,
+  refreshed_through  TIMESTAMPTZ NOT NULL
+);
@@ -6,17 +6,33 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+from src.db.sqlite import build_sqlite_engine, is_sqlite_url
+
 def build_engine(echo: bool = False) -> Engine:
     DATABASE_URL = os.getenv("DATABASE_URL")
     if not DATABASE_URL:
         raise RuntimeError("DATABASE_URL is not set. Put in your .env or environment")
+    if is_sqlite_url(DATABASE_URL):
+        return build_sqlite_engine(DATABASE_URL, echo= echo)
     return create_engine(DATABASE_URL, echo= echo, pool_pre_ping= True)
 
+def build_read_engine(echo: bool = False) -> Engine | None:
+    """Optional read-replica engine. Returns None when DATABASE_READ_URL is not set."""
+    DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+    if not DATABASE_READ_URL:
+        return None
+    return create_engine(DATABASE_READ_URL, echo= echo, pool_pre_ping= True)
+
 SessionLocal = sessionmaker(autocommit = False, autoflush= False)
+ReadSessionLocal = sessionmaker(autocommit = False, autoflush= False)
 
 def init_session_factory(engine: Engine) -> None:
     SessionLocal.configure(bind = engine)
 
+def init_read_session_factory(engine: Engine | None) -> None:
+    """Bind read-only sessions to the replica, or to the primary when there is none."""
+    ReadSessionLocal.configure(bind = engine if engine is not None else SessionLocal.kw.get("bind"))
+
 def db_health_check(engine: Engine) -> None:
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Per-session locks for long-running session jobs (ingest, export, AI manifest).
+
+On Postgres these are session-level advisory locks on a single bigint key
+(see advisory_lock_key), so every web worker and CLI process on every host
+sees the same lock. Locks are never waited on: a
+second caller for the same session and operation gets SessionBusyError
+straight away. Different sessions, and different operations on the same
+session, do not block each other.
+
+The lock is held on its own pooled connection for the duration of the job,
+so the job's ORM session is free to commit as often as it likes. If the
+process dies the connection drops and Postgres releases the lock.
+
+SQLite edge mode has a single station, so a process-local lock is enough.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+
+from src.db.session import SessionLocal
+
+OPERATIONS = ("ingest", "export", "manifest")
+
+# Advisory lock key layout: 16-bit app namespace | 8-bit operation | 40-bit session id.
+# import_session_id is BIGINT, so the two-int4 lock form would overflow past 2^31-1.
+_LOCK_NAMESPACE = 0x1D55
+_SESSION_ID_BITS = 40
+
+_local_locks: dict[tuple[str, int], threading.Lock] = {}
+_local_guard = threading.Lock()
+
+
+class SessionBusyError(RuntimeError):
+    def __init__(self, operation: str, import_session_id: int):
+        self.operation = operation
+        self.import_session_id = import_session_id
+        super().__init__(f"{operation.capitalize()} is already running for session {import_session_id}")
+
+
+def advisory_lock_key(operation: str, import_session_id: int) -> int:
+    """Distinct bigint advisory lock key for every (operation, session) pair."""
+    if not 0 <= import_session_id < 1 << _SESSION_ID_BITS:
+        raise ValueError(f"import_session_id out of advisory lock range: {import_session_id}")
+    return (_LOCK_NAMESPACE << 48) | (OPERATIONS.index(operation) << _SESSION_ID_BITS) | import_session_id
+
+
+@contextmanager
+def _local_lock(operation: str, import_session_id: int) -> Iterator[None]:
+    with _local_guard:
+        lock = _local_locks.setdefault((operation, import_session_id), threading.Lock())
+    if not lock.acquire(blocking=False):
+        raise SessionBusyError(operation, import_session_id)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+@contextmanager
+def session_lock(operation: str, import_session_id: int) -> Iterator[None]:
+    """
+    Hold the <operation> lock for one import session, or raise SessionBusyError
+    if another worker already holds it.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown session lock operation: {operation}")
+
+    engine = SessionLocal.kw.get("bind")
+    if engine is None:
+        raise RuntimeError("Session factory is not initialised")
+
+    import_session_id = int(import_session_id)
+    if engine.dialect.name != "postgresql":
+        with _local_lock(operation, import_session_id):
+            yield
+        return
+
+    params = {"key": advisory_lock_key(operation, import_session_id)}
+    with engine.connect() as conn:
+        got = conn.execute(text("SELECT pg_try_advisory_lock(CAST(:key AS bigint))"), params).scalar_one()
+        # Session-level locks outlive the transaction; end it so the connection sits idle
+        conn.commit()
+        if not got:
+            raise SessionBusyError(operation, import_session_id)
+
+        try:
+            yield
+        finally:
+            # Must unlock explicitly: returning the connection to the pool does not release it
+            conn.execute(text("SELECT pg_advisory_unlock(CAST(:key AS bigint))"), params)
+            conn.commit()
@@ -0,0 +1,68 @@
+"""
+SQLite edge mode for single-station deployments without a Postgres server.
+
+DATABASE_URL=sqlite:///data/ipds_edge.db
+
+The database file is ATTACHed as schema "ipds" on every connection, so the
+models, raw SQL and Alembic migrations keep using ipds.<table> unchanged.
+Each connection is tuned with:
+- journal_mode=WAL     readers never block the single writer
+- synchronous=NORMAL   durable across app crashes, fsync only at checkpoints
+- mmap_size            reads served from the page cache (SQLITE_MMAP_SIZE)
+- foreign_keys=ON      SQLite leaves FK enforcement off by default
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sqlalchemy import BigInteger, create_engine, event, pool
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.compiler import compiles
+
+from src.config import Config
+from src.db.base import DB_SCHEMA
+
+SQLITE_MMAP_SIZE = Config.SQLITE_MMAP_SIZE
+SQLITE_BUSY_TIMEOUT_MS = Config.SQLITE_BUSY_TIMEOUT_MS
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    # Only a column declared INTEGER becomes the rowid alias (autoincrementing PK).
+    # SQLite integers are 64-bit either way.
+    return "INTEGER"
+
+
+def is_sqlite_url(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def build_sqlite_engine(url: str, echo: bool = False, poolclass=None) -> Engine:
+    db_path = make_url(url).database
+    if not db_path or db_path == ":memory:":
+        raise RuntimeError("SQLite edge mode needs a database file path, e.g. sqlite:///data/ipds_edge.db")
+    db_path = str(Path(db_path).resolve())
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # The main database is a throwaway in-memory one; all data lives in the attached file.
+    engine = create_engine(
+        "sqlite://",
+        echo=echo,
+        poolclass=poolclass or pool.QueuePool,
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _attach_and_tune(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        cur.execute(f"ATTACH DATABASE ? AS {DB_SCHEMA}", (db_path,))
+        cur.execute(f"PRAGMA {DB_SCHEMA}.journal_mode=WAL")
+        cur.execute(f"PRAGMA {DB_SCHEMA}.synchronous=NORMAL")
+        cur.execute(f"PRAGMA {DB_SCHEMA}.mmap_size={SQLITE_MMAP_SIZE}")
+        cur.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+
+    return engine
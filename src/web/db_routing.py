@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+
+from flask import request, session
+from sqlalchemy.orm import Session
+
+from src.config import Config
+from src.db.session import SessionLocal, ReadSessionLocal
+from src.web.auth import SESSION_OPERATOR_KEY
+
+SESSION_LAST_WRITE_KEY = "last_write_at"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def mark_write_after_request(response):
+    """Remember when this operator last changed something."""
+    if request.method in WRITE_METHODS and session.get(SESSION_OPERATOR_KEY):
+        session[SESSION_LAST_WRITE_KEY] = time.time()
+    return response
+
+
+def read_session() -> Session:
+    """
+    Session for read-only pages.
+    Goes to the replica unless the operator wrote recently (read-your-writes).
+    """
+    last_write = session.get(SESSION_LAST_WRITE_KEY)
+    if last_write is not None and time.time() - float(last_write) < Config.READ_AFTER_WRITE_SECONDS:
+        return SessionLocal()
+    return ReadSessionLocal()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from flask import Blueprint, render_template, request
+
+from src.core.analytics_service import AnalyticsService
+from src.web.auth import login_required, get_current_operator_id
+from src.web.db_routing import read_session
+from src.web.sql_stats import query_budget
+
+bp = Blueprint("analytics", __name__)
+
+MAX_WINDOW_DAYS = 366
+
+
+@bp.get("/analytics")
+@login_required
+@query_budget(4)
+def analytics_page():
+    days = request.args.get("days", 7, type=int) or 7
+    days = min(max(days, 1), MAX_WINDOW_DAYS)
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+
+    # Rollup tables only; refreshed by `python -m src.db.rollups refresh`
+    with read_session() as db:
+        refreshed_through = AnalyticsService.refreshed_through(db)
+        summary = AnalyticsService.operator_summary(db, since=since)
+        reasons = AnalyticsService.reject_reasons(db, since=since)
+        hours = AnalyticsService.operator_hours(db, since=since)
+
+    return render_template(
+        "analytics.html",
+        operator_id=get_current_operator_id(),
+        days=days,
+        refreshed_through=refreshed_through,
+        summary=summary,
+        reasons=reasons,
+        hours=hours,
+    )
@@ -4,6 +4,7 @@ from __future__ import annotations
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 
 from src.db.session import SessionLocal
+from src.db.ref_cache import get_operator
 from src.web.auth import SESSION_OPERATOR_KEY
 
 bp = Blueprint("auth", __name__)
@@ -24,9 +25,8 @@ def login_post():
         flash("Operator ID is required.", "error")
         return redirect(url_for("auth.login", next=next_url))
     try:
-        from src.db.models import Operators  # type: ignore
         with SessionLocal() as db:
-            op = db.get(Operators, operator_id)
+            op = get_operator(db, operator_id)
             if not op:
                 flash("Invalid Operator ID (not found in DB).", "error")
                 return redirect(url_for("auth.login", next=next_url))
@@ -1,51 +1,70 @@
 from __future__ import annotations
 
-from pathlib import Path
-from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, send_file
-from sqlalchemy import select
+import json
+from flask import (
+    Blueprint, Response, jsonify, render_template, request, redirect, url_for, flash, abort, send_file,
+    stream_with_context,
+)
 
 from src.db.session import SessionLocal
-from src.db.models import Media, ImportSession, Decisions
+from src.db.decision_events import decision_events_supported, open_decision_listener
 from src.core.decision_service import DecisionService, DecisionServiceError
 from src.web.auth import login_required
-from src.core.ai_review_manifest import AIReviewManifestService, AIReviewManifestError
+from src.web.db_routing import read_session
+from src.web.sql_stats import query_budget
+from src.core.ai_review_manifest import DEFAULT_BLUR_THRESHOLD, AIReviewManifestService
+from src.core.ai_review_jobs import manifest_build_state, start_manifest_build
 
 bp = Blueprint("decisions", __name__)
 
-ALLOWED_MEDIA_ROOTS = [
-    Path("data/incoming").resolve(),
-    Path("data/archive").resolve(),
-]
-
-
 @bp.get("/sessions/<int:import_session_id>/decide")
 @login_required
+@query_budget(10)
 def decide_page(import_session_id: int):
-    ai_manifest = None
-    ai_manifest_path = None
-    ai_error = None
-
-    with SessionLocal() as db:
+    with read_session() as db:
         rows = DecisionService.list_media_for_session(db, import_session_id)
 
-        try:
-            ai_service = AIReviewManifestService()
-            ai_manifest, ai_manifest_path = ai_service.build_and_write_manifest(db, import_session_id)
-        except AIReviewManifestError as e:
-            ai_error = str(e)
-        except Exception as e:
-            ai_error = f"AI review unavailable: {e}"
+    # Render with whatever AI results already exist; the page polls for the rest
+    ai_manifest = AIReviewManifestService.read_manifest(import_session_id)
+    start_manifest_build(import_session_id)
+
+    ai_results = {item["media_id"]: item for item in ai_manifest["media_results"]} if ai_manifest else {}
 
     return render_template(
         "sessions_decide.html",
         import_session_id=import_session_id,
         rows=rows,
         ai_manifest=ai_manifest,
-        ai_manifest_path=str(ai_manifest_path) if ai_manifest_path else None,
-        ai_error=ai_error,
+        ai_results=ai_results,
+        blur_threshold=DEFAULT_BLUR_THRESHOLD,
+        live_updates=decision_events_supported(),
     )
 
 
+@bp.get("/sessions/<int:import_session_id>/decide/ai")
+@login_required
+@query_budget(0)
+def decide_ai_status(import_session_id: int):
+    """
+    AI review progress for the decide page to poll.
+    The manifest is only included when it changed since ?since=<generated_at>.
+    """
+    state, error = manifest_build_state(import_session_id)
+    manifest = AIReviewManifestService.read_manifest(import_session_id)
+
+    if state == "idle" and (manifest is None or manifest.get("status") != "complete"):
+        # Left unfinished by a build that died (or is finishing in another worker): resume it
+        start_manifest_build(import_session_id)
+        state = "running"
+    elif state == "idle":
+        state = "complete"
+
+    if manifest is not None and manifest.get("generated_at") == request.args.get("since"):
+        manifest = None
+
+    return jsonify({"state": state, "error": error, "manifest": manifest})
+
+
 @bp.post("/sessions/<int:import_session_id>/decide/bulk")
 @login_required
 def bulk_decide(import_session_id: int):
@@ -83,6 +102,8 @@ def decide_one(media_id: int):
     reason = (request.form.get("reason", "") or "").strip() or None
     notes = (request.form.get("notes", "") or "").strip() or None
     import_session_id = int(request.form.get("import_session_id"))
+    raw_version = (request.form.get("expected_version") or "").strip()
+    expected_version = int(raw_version) if raw_version.isdigit() else None
 
     try:
         with SessionLocal() as db:
@@ -93,6 +114,7 @@ def decide_one(media_id: int):
                 status=action,
                 reason=reason,
                 notes=notes,
+                expected_version=expected_version,
             )
             db.commit()
         flash(f"Media {media_id} -> {action}", "success")
@@ -102,103 +124,44 @@ def decide_one(media_id: int):
     return redirect(url_for("decisions.decide_page", import_session_id=import_session_id))
 
 
-def _resolve_media_path(raw: str) -> Path:
-    p = Path(raw)
-
-    if not p.is_absolute():
-        p = Path.cwd() / p
-
-    try:
-        return p.resolve(strict=False)
-    except Exception:
-        abort(404)
-
-
-def _is_under_allowed_root(p: Path) -> bool:
-    try:
-        p = p.resolve(strict=False)
-    except Exception:
-        return False
-
-    for root in ALLOWED_MEDIA_ROOTS:
-        root = root.resolve()
-        try:
-            p.relative_to(root)
-            return True
-        except ValueError:
-            continue
-    return False
-
-
-def _build_archive_candidates(*, uut_serial: str, import_session_id: int, filename: str) -> list[Path]:
-    archive_base = Path("data/archive") / f"{uut_serial}_{import_session_id}"
-    return [
-        archive_base / "accepted" / filename,
-        archive_base / "rejected" / filename,
-        archive_base / filename,  # fallback in case archive was stored flat
-    ]
-
-
-def _find_best_media_path(db, media_id: int) -> Path | None:
-    """
-    Resolve media path in this order:
-    1. current Media.local_path if file still exists
-    2. archived accepted path
-    3. archived rejected path
-    4. flat archive fallback
+@bp.get("/sessions/<int:import_session_id>/decide/events")
+@login_required
+def decide_events(import_session_id: int):
     """
-    stmt = (
-        select(Media, ImportSession, Decisions)
-        .join(ImportSession, ImportSession.import_session_id == Media.import_session_id)
-        .outerjoin(Decisions, Decisions.media_id == Media.media_id)
-        .where(Media.media_id == media_id)
-    )
+    Server-sent events stream of decision changes made by any reviewer
+    on this session. The decide page applies them in place.
 
-    row = db.execute(stmt).first()
-    if not row:
-        return None
-
-    media, session_row, decision_row = row
+    204 (EventSource stops retrying) when live updates are unavailable;
+    503 when this worker already serves its maximum number of streams.
+    """
+    if not decision_events_supported():
+        return Response(status=204)
 
-    if media.local_path:
-        current_path = _resolve_media_path(media.local_path)
-        if _is_under_allowed_root(current_path) and current_path.exists() and current_path.is_file():
-            return current_path
+    listener = open_decision_listener(import_session_id)
+    if listener is None:
+        return Response("Too many live update streams", status=503, headers={"Retry-After": "30"})
 
-    candidates = _build_archive_candidates(
-        uut_serial=session_row.uut_serial,
-        import_session_id=session_row.import_session_id,
-        filename=media.filename,
-    )
+    def stream():
+        try:
+            for event in listener.events():
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: decision\ndata: {json.dumps(event)}\n\n"
+        finally:
+            listener.close()
 
-    if decision_row and decision_row.status == "accepted":
-        ordered = [
-            candidates[0],  # accepted
-            candidates[1],  # rejected
-            candidates[2],  # flat
-        ]
-    elif decision_row and decision_row.status == "rejected":
-        ordered = [
-            candidates[1],  # rejected
-            candidates[0],  # accepted
-            candidates[2],  # flat
-        ]
-    else:
-        ordered = candidates
-
-    for candidate in ordered:
-        resolved = _resolve_media_path(str(candidate))
-        if _is_under_allowed_root(resolved) and resolved.exists() and resolved.is_file():
-            return resolved
-
-    return None
+    response = Response(stream_with_context(stream()), mimetype="text/event-stream")
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
 
 @bp.get("/media/<int:media_id>/file")
 @login_required
+@query_budget(2)
 def media_file(media_id: int):
-    with SessionLocal() as db:
-        p = _find_best_media_path(db, media_id)
+    with read_session() as db:
+        p = DecisionService.find_media_path(db, media_id)
 
     if not p:
         abort(404)
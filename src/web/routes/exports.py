@@ -3,9 +3,11 @@ from sqlalchemy import select, func
 from pathlib import Path
 
 from src.db.session import SessionLocal
-from src.db.models import ImportSession, Media, Decisions, Exports
+from src.db.models import Media, Decisions, Exports
+from src.db.ref_cache import get_session_header
 from src.web.auth import login_required
 from src.core.export_zip import export_session_to_zip
+from src.db.session_locks import SessionBusyError
 
 bp = Blueprint("exports", __name__)
 
@@ -16,7 +18,7 @@ ARCHIVE_ROOT = Path("data/archive")
 @login_required
 def export_page(import_session_id: int):
     with SessionLocal() as db:
-        sess = db.get(ImportSession, import_session_id)
+        sess = get_session_header(db, import_session_id)
         if not sess:
             flash("Import session not found.", "error")
             return redirect(url_for("sessions.dashboard"))
@@ -73,6 +75,8 @@ def export_run(import_session_id: int):
                 archive_root=ARCHIVE_ROOT,
             )
             flash(f"Export complete. Status: archived", "success")
+        except SessionBusyError:
+            flash("An export for this session is already running. Try again when it finishes.", "error")
         except Exception as e:
             flash(f"Export failed: {str(e)}", "error")
 
@@ -6,8 +6,12 @@ from sqlalchemy.exc import IntegrityError
 
 from src.db.session import SessionLocal
 from src.db.models import ImportSession, Media, Jobs
+from src.db.ref_cache import get_session_header, invalidate_jobs
+from src.db.session_locks import SessionBusyError
 from src.core.ingestion_service import run_ingestion_for_session
 from src.web.auth import login_required
+from src.web.db_routing import read_session
+from src.web.sql_stats import query_budget
 
 bp = Blueprint("ingestion", __name__)
 
@@ -15,7 +19,7 @@ bp = Blueprint("ingestion", __name__)
 @login_required
 def ingest_page(import_session_id: int):
     with SessionLocal() as db:
-        session_row = db.get(ImportSession, import_session_id)
+        session_row = get_session_header(db, import_session_id)
         if not session_row:
             flash("Import session not found", "error")
             return redirect(url_for("sessions.dashboard"))
@@ -42,6 +46,8 @@ def run_ingest(import_session_id: int):
             f"Failed: {result.get('failed', 0)}",
             "success",
         )
+    except SessionBusyError:
+        flash("Ingestion for this session is already running. Try again when it finishes.", "error")
     except Exception as e:
         flash(f"Ingestion failed: {str(e)}", "error")
 
@@ -67,6 +73,7 @@ def create_job():
             job = Jobs(job_id=job_id)
             db.add(job)
             db.commit()
+            invalidate_jobs()
             flash(f"Job created: {job_id}", "success")
             return redirect(url_for("sessions.dashboard"))
 
@@ -78,8 +85,9 @@ def create_job():
 
 @bp.get("/jobs")
 @login_required
+@query_budget(2)
 def jobs_page():
-    with SessionLocal() as db:
+    with read_session() as db:
         jobs = db.scalars(select(Jobs).order_by(Jobs.job_id.desc()).limit(200)).all()
     return render_template("jobs.html", jobs=jobs)
 
@@ -109,5 +117,6 @@ def close_job(job_id: str):
             job.status = "closed"
 
         db.commit()
+        invalidate_jobs()
         flash(f"Job closed: {job_id}", "success")
         return redirect(url_for("ingestion.jobs_page"))
\ No newline at end of file
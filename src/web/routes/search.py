@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from flask import Blueprint, render_template, request
+
+from src.core.search_service import SearchService, SearchServiceError
+from src.web.auth import login_required, get_current_operator_id
+from src.web.db_routing import read_session
+from src.web.sql_stats import query_budget
+
+bp = Blueprint("search", __name__)
+
+SEARCH_KINDS = ("sessions", "jobs")
+
+
+@bp.get("/search")
+@login_required
+@query_budget(1)
+def search_page():
+    q = (request.args.get("q") or "").strip()
+    kind = request.args.get("kind", "sessions")
+    mode = request.args.get("mode", "contains")
+    page = request.args.get("page", 1, type=int) or 1
+
+    if kind not in SEARCH_KINDS:
+        kind = "sessions"
+
+    results = None
+    error = None
+    if q:
+        try:
+            with read_session() as db:
+                if kind == "jobs":
+                    results = SearchService.search_jobs(db, q, mode=mode, page=page)
+                else:
+                    results = SearchService.search_sessions(db, q, mode=mode, page=page)
+        except SearchServiceError as e:
+            error = str(e)
+
+    return render_template(
+        "search.html",
+        operator_id=get_current_operator_id(),
+        q=q,
+        kind=kind,
+        mode=mode,
+        results=results,
+        error=error,
+    )
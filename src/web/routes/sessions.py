@@ -3,12 +3,15 @@ from __future__ import annotations
 import shutil
 from pathlib import Path
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify
 from sqlalchemy import select, func, case
 
 from src.db.session import SessionLocal
 from src.db.models import ImportSession, Jobs, Media, Decisions, Exports
+from src.db.ref_cache import cache_stats, invalidate_session, list_open_jobs
 from src.web.auth import login_required, get_current_operator_id
+from src.web.db_routing import read_session
+from src.web.sql_stats import query_budget
 
 bp = Blueprint("sessions", __name__)
 
@@ -34,10 +37,11 @@ def _get_archive_dir_for_session(session_row) -> Path:
 
 @bp.get("/dashboard")
 @login_required
+@query_budget(25)
 def dashboard():
     operator_id = get_current_operator_id()
 
-    with SessionLocal() as db:
+    with read_session() as db:
         session_rows = db.scalars(
             select(ImportSession)
             .where(ImportSession.status == "running")
@@ -62,22 +66,21 @@ def dashboard():
     return render_template("dashboard.html", operator_id=operator_id, sessions=sessions)
 
 
+@bp.get("/cache/stats")
+@login_required
+def reference_cache_stats():
+    """Hit/miss counters of this worker's reference-data cache."""
+    return jsonify(cache_stats())
+
+
 @bp.get("/sessions/new")
 @login_required
+@query_budget(1)
 def new_session_page():
     operator_id = get_current_operator_id()
 
-    with SessionLocal() as db:
-        stmt = select(Jobs).order_by(Jobs.job_id.desc())
-        jobs = db.scalars(stmt).all()
-
-    open_jobs = []
-    for j in jobs:
-        if hasattr(j, "status"):
-            if (j.status or "").lower() not in ("closed", "ended"):
-                open_jobs.append(j)
-        else:
-            open_jobs.append(j)
+    with read_session() as db:
+        open_jobs = list_open_jobs(db)
 
     return render_template("session_new.html", operator_id=operator_id, jobs=open_jobs)
 
@@ -157,6 +160,7 @@ def complete_session(import_session_id: int):
 
         session_row.status = "completed"
         db.commit()
+    invalidate_session(import_session_id)
 
     flash(f"Session {import_session_id} completed.", "success")
     return redirect(url_for("sessions.dashboard"))
@@ -183,16 +187,18 @@ def cancel_session(import_session_id: int):
 
         session_row.status = "failed"
         db.commit()
+    invalidate_session(import_session_id)
 
     flash(f"Session {import_session_id} cancelled.", "success")
     return redirect(url_for("sessions.dashboard"))
 
 @bp.get("/sessions/archive")
 @login_required
+@query_budget(2)
 def archive_page():
     operator_id = get_current_operator_id()
 
-    with SessionLocal() as db:
+    with read_session() as db:
         total_count = func.count(Media.media_id).label("total_count")
 
         accepted_count = func.coalesce(
@@ -266,6 +272,7 @@ def amend_session(import_session_id: int):
         # Reopen session for decision correction
         session_row.status = "running"
         db.commit()
+    invalidate_session(import_session_id)
 
     flash(
         f"Session {import_session_id} reopened for amendment by operator {operator_id}.",
@@ -0,0 +1,118 @@
+"""
+Per-request SQL instrumentation.
+
+Counts queries, total DB time and repeated statement shapes for every Flask
+request, then:
+- adds a Server-Timing header (visible in browser dev tools)
+- logs one line per request, plus a warning for likely N+1 patterns
+- in strict mode, fails the request when a route goes over its query budget
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Same statement text this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass
+class RequestSQLStats:
+    count: int = 0
+    total_ms: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list[tuple[str, int]]:
+        return [(stmt, n) for stmt, n in self.shapes.most_common() if n >= threshold]
+
+
+def query_budget(max_queries: int):
+    """Declare the maximum number of queries a view may issue."""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            g.sql_query_budget = max_queries
+            return view_func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("sql_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    starts = conn.info.get("sql_stats_start")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000.0
+
+    stats = g.get("sql_stats")
+    if stats is None:
+        return
+    stats.count += 1
+    stats.total_ms += elapsed_ms
+    stats.shapes[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def init_sql_stats(app: Flask, *engines: Engine | None) -> None:
+    for engine in engines:
+        if engine is not None:
+            instrument_engine(engine)
+
+    @app.before_request
+    def start_sql_stats():
+        g.sql_stats = RequestSQLStats()
+
+    @app.after_request
+    def report_sql_stats(response):
+        stats = g.get("sql_stats")
+        if stats is None:
+            return response
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={stats.total_ms:.2f};desc="{stats.count} queries"',
+        )
+        logger.info(
+            "%s %s -> %s: %d queries, %.1f ms db",
+            request.method, request.path, response.status_code, stats.count, stats.total_ms,
+        )
+        for stmt, n in stats.repeated():
+            logger.warning(
+                "Possible N+1 on %s %s: statement ran %d times: %s",
+                request.method, request.path, n, " ".join(stmt.split())[:200],
+            )
+
+        # pop: the 500 response for the raise below passes through here again
+        budget = g.pop("sql_query_budget", None)
+        if Config.SQL_STRICT_QUERY_BUDGET and budget is not None and stats.count > budget:
+            raise QueryBudgetExceeded(
+                f"{request.endpoint} issued {stats.count} queries (budget {budget})"
+            )
+        return response